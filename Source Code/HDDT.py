@@ -4,29 +4,43 @@
 #             It recursively splits the dataset based on the feature and threshold that maximize               *
 #            the Hellinger distance, constructing a decision tree for classification. The function             *
 #         handles edge cases where all labels are the same or the number of samples is below a cutoff.         *
+#       Nodes hold the indices of their rows, and only gather their rows of the searched columns to split.     *
 #                                                                                                              *
 #***************************************************************************************************************
 
 
 
 import numpy as np
-from scipy.stats import mode
-from compute_hellinger_distance import compute_hellinger_distance
+from time import perf_counter
+from scipy.sparse import issparse
+from compute_hellinger_distance_hist import compute_hellinger_distance_hist
+from HDDT_sparse import HDDT_sparse
 from HellingerTreeNode import HellingerTreeNode
 
 
 
-def HDDT(features, labels, model, num_bins, cutoff, mem_thresh, mem_split):
-    num_samples = features.shape[0]
+def HDDT(features, labels, model, num_bins, cutoff, mem_thresh, mem_split, columns=None, monitor=None, depth=0, rows=None):
+    if issparse(features):                                                      # Sparse matrices are split without densifying
+        return HDDT_sparse(features, labels, model, num_bins, cutoff, rows=rows, columns=columns, monitor=monitor)
+    labels = np.asarray(labels).reshape(-1)
+    node_labels = labels if rows is None else labels[rows]
+    num_samples = node_labels.shape[0]
+    timed = monitor is not None
+    num_positive = np.count_nonzero(node_labels == 1)
+    model.set_counts(num_samples, num_positive)
     
     # Check if all labels are the same or if the number of samples is below the cutoff
-    if len(np.unique(labels)) == 1 or num_samples <= cutoff:
-        model.complete = True
-        model.label = mode(labels)[0][0]                                        # Set label to the most frequent class
-        model.score = np.sum(labels) / len(labels)                              # Compute the score
+    if num_positive == 0 or num_positive == num_samples or num_samples <= cutoff:
+        start = perf_counter() if timed else 0
+        model.make_leaf()
+        if timed:
+            monitor.record_node(depth, num_samples, True, leaf_seconds=perf_counter() - start)
         return model
+    start = perf_counter() if timed else 0
+    bytes_copied = 0
     
-    num_features = features.shape[1]
+    # Restrict the split search to a subset of columns; node features index into them
+    num_features = features.shape[1] if columns is None else len(columns)
     selected_feature = -1
     selected_threshold = -1
     selected_distance = -1
@@ -39,36 +53,54 @@ def HDDT(features, labels, model, num_bins, cutoff, mem_thresh, mem_split):
     for i in range(0, num_features, max(1, num_features // mem_split)):
         max_index = min(num_features, i + max(1, num_features // mem_split))
         feature_indices = np.arange(i, max_index)
-        features_temp = features[:, feature_indices]
+        if rows is None and columns is None and max_index - i == num_features:
+            features_temp = features                                            # Whole root matrix, nothing to gather
+        else:
+            searched = feature_indices if columns is None else columns[feature_indices]
+            features_temp = features[:, searched] if rows is None else features[np.ix_(rows, searched)]
+            bytes_copied += features_temp.nbytes                                # Only this node's rows of this chunk of columns
         
-        feature_index, feature_distance, feature_threshold = compute_hellinger_distance(features_temp, labels, num_bins)
+        feature_index, feature_distance, feature_threshold = compute_hellinger_distance_hist(features_temp, node_labels, num_bins)
         
         if feature_distance > selected_distance:
             selected_feature = feature_indices[feature_index]
             selected_threshold = feature_threshold
             selected_distance = feature_distance
+        del features_temp
     
     model.threshold = selected_threshold
     model.feature = selected_feature
     
-    # Split the dataset into left and right branches
-    features_left = features[features[:, selected_feature] <= selected_threshold]
-    labels_left = labels[features[:, selected_feature] <= selected_threshold]
-    features_right = features[features[:, selected_feature] > selected_threshold]
-    labels_right = labels[features[:, selected_feature] > selected_threshold]
+    if timed:
+        split_seconds = perf_counter() - start
+        start = perf_counter()
+
+    # Split the node's row indices into left and right rows; the feature data is never copied
+    split_feature = selected_feature if columns is None else columns[selected_feature]
+    split_column = features[:, split_feature] if rows is None else features[rows, split_feature]
+    node_rows = np.arange(num_samples) if rows is None else rows
+    rows_left = node_rows[split_column <= selected_threshold]
+    rows_right = node_rows[split_column > selected_threshold]
+    if timed:
+        partition_seconds = perf_counter() - start
+        bytes_copied += rows_left.nbytes + rows_right.nbytes
+        start = perf_counter()
     
     # Check for pure split cases
-    if features_left.shape[0] == num_samples or features_right.shape[0] == num_samples:
-        model.complete = True
-        model.label = mode(labels)[0][0]
-        model.score = np.sum(labels) / len(labels)
+    if rows_left.shape[0] == num_samples or rows_right.shape[0] == num_samples:
+        model.make_leaf()
+        if timed:
+            monitor.record_node(depth, num_samples, True, split_seconds, partition_seconds, perf_counter() - start, bytes_copied)
         return model
+    if timed:
+        monitor.record_node(depth, num_samples, False, split_seconds, partition_seconds, bytes_copied=bytes_copied)
+    del split_column, node_rows
     
     # Recursively build the left and right branches
     model_left = HellingerTreeNode()
     model_right = HellingerTreeNode()
     
-    model.left_branch = HDDT(features_left, labels_left, model_left, num_bins, cutoff, mem_thresh, mem_split)
-    model.right_branch = HDDT(features_right, labels_right, model_right, num_bins, cutoff, mem_thresh, mem_split)
+    model.left_branch = HDDT(features, labels, model_left, num_bins, cutoff, mem_thresh, mem_split, columns, monitor, depth + 1, rows_left)
+    model.right_branch = HDDT(features, labels, model_right, num_bins, cutoff, mem_thresh, mem_split, columns, monitor, depth + 1, rows_right)
     model.complete = False
     return model
@@ -0,0 +1,111 @@
+#***************************************************************************************************************
+#                                                                                                              *
+#         This function implements the Hellinger Distance Decision Tree (HDDT) algorithm on pre-binned        *
+#       features. The feature matrix is quantized once at the root and every node evaluates the same bin       *
+#      edges. Nodes never copy feature data: they own a range of one shared row-index buffer, which is         *
+#     partitioned in place when the node is split. The real-valued bin edges are written into the nodes        *
+#                     as thresholds, so the resulting tree is used exactly like an HDDT tree.                  *
+#       Because every node uses the same bins, a parent's class histograms are the sum of its children's:      *
+#     only the smaller child is scanned and the larger child's histograms are obtained by subtraction. A node  *
+#        releases its histograms once its children's are derived, so only pending siblings hold histograms.    *
+#      With merge > 1 the codes and edges are at a finer resolution and every merge consecutive bins form one  *
+#            bin, so one quantization of the data serves every numBins that divides its number of bins.        *
+#                                                                                                              *
+#***************************************************************************************************************
+
+
+
+import numpy as np
+from time import perf_counter
+from compute_class_histograms import compute_class_histograms
+from select_hellinger_split import select_hellinger_split
+from HellingerTreeNode import HellingerTreeNode
+
+
+
+def HDDT_binned(codes, edges, labels, model, num_bins, cutoff, rows=None, columns=None, monitor=None, merge=1):
+    labels = np.asarray(labels).reshape(-1)
+    order = np.arange(codes.shape[0]) if rows is None else np.array(rows, dtype=np.intp)    # Shared row-index buffer
+    columns = np.arange(codes.shape[1]) if columns is None else np.asarray(columns)          # Columns searched, node features index into them
+    _grow(codes, edges, labels, order, 0, order.shape[0], model, num_bins, cutoff, columns, None, monitor, 0, merge)
+    return model
+
+
+
+def _grow(codes, edges, labels, order, start, end, model, num_bins, cutoff, columns, histograms, monitor, depth, merge):
+    timed = monitor is not None
+    rows = order[start:end]
+    num_samples = end - start
+    num_positive = np.count_nonzero(labels[rows] == 1)
+    model.set_counts(num_samples, num_positive)
+
+    # Check if all labels are the same or if the number of samples is below the cutoff
+    if num_positive == 0 or num_positive == num_samples or num_samples <= cutoff:
+        if timed:
+            monitor.record_node(depth, num_samples, True)
+        return model.make_leaf()
+
+    # Find the best feature and bin edge from the class histograms of this node
+    split_start = perf_counter() if timed else 0
+    bytes_copied = 0
+    if histograms is None:
+        histograms = _histograms(codes, labels, rows, num_bins, columns, merge)
+        bytes_copied += num_samples * len(columns) * codes.itemsize
+    feature, _, threshold_index = select_hellinger_split(histograms)
+    threshold_index = (threshold_index + 1) * merge - 1                                     # Last fine bin of the selected bin
+    model.threshold = edges[threshold_index, columns[feature]]
+    model.feature = feature
+    if timed:
+        split_seconds = perf_counter() - split_start
+        partition_start = perf_counter()
+
+    # Partition the node's range of the index buffer into left and right rows
+    go_left = codes[rows, columns[feature]] <= threshold_index
+    num_left = np.count_nonzero(go_left)
+    if num_left == 0 or num_left == num_samples:                                            # Check for pure split cases
+        if timed:
+            monitor.record_node(depth, num_samples, True, split_seconds, perf_counter() - partition_start, 0, bytes_copied)
+        return model.make_leaf()
+    order[start:end] = np.concatenate((rows[go_left], rows[~go_left]))
+    if timed:
+        partition_seconds = perf_counter() - partition_start
+        bytes_copied += 2 * rows.nbytes
+        split_start = perf_counter()
+
+    # Scan the smaller child and derive the larger child's histograms from the parent's
+    left_positive = np.count_nonzero(labels[order[start:start + num_left]] == 1)
+    needs_left = _needs_split(left_positive, num_left, cutoff)
+    needs_right = _needs_split(num_positive - left_positive, num_samples - num_left, cutoff)
+    child_histograms = [None, None]
+    if needs_left or needs_right:
+        small = 0 if 2 * num_left <= num_samples else 1
+        small_start, small_end = (start, start + num_left) if small == 0 else (start + num_left, end)
+        child_histograms[small] = _histograms(codes, labels, order[small_start:small_end], num_bins, columns, merge)
+        child_histograms[1 - small] = histograms - child_histograms[small]
+        if timed:
+            bytes_copied += (small_end - small_start) * len(columns) * codes.itemsize
+    del histograms, rows, go_left                                                           # Keep no histograms for finished nodes
+    if timed:
+        monitor.record_node(depth, num_samples, False, split_seconds + perf_counter() - split_start, partition_seconds,
+                            bytes_copied=bytes_copied)
+
+    # Recursively build the left and right branches, handing each its histograms
+    model.left_branch = _grow(codes, edges, labels, order, start, start + num_left, HellingerTreeNode(),
+                              num_bins, cutoff, columns, child_histograms.pop(0), monitor, depth + 1, merge)
+    model.right_branch = _grow(codes, edges, labels, order, start + num_left, end, HellingerTreeNode(),
+                               num_bins, cutoff, columns, child_histograms.pop(0), monitor, depth + 1, merge)
+    model.complete = False
+    return model
+
+
+
+def _needs_split(num_positive, num_samples, cutoff):
+    return 0 < num_positive < num_samples and num_samples > cutoff
+
+
+
+def _histograms(codes, labels, rows, num_bins, columns, merge):
+    node_codes = codes[np.ix_(rows, columns)]
+    if merge > 1:                                                                           # Fine codes to merged bin codes
+        node_codes //= merge
+    return compute_class_histograms(node_codes, labels[rows], num_bins)
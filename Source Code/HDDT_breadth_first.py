@@ -0,0 +1,131 @@
+#***************************************************************************************************************
+#                                                                                                              *
+#        This function implements the Hellinger Distance Decision Tree (HDDT) algorithm without recursion.    *
+#       Nodes waiting to be split are kept in a breadth-first frontier, and the split statistics of all nodes  *
+#      on one depth level are computed together: their rows are binned against their own thresholds and the   *
+#     class histograms of every node are built in one pass. The tree can be bounded by depth and number of    *
+#          leaves; without those limits it is the same tree as the recursive HDDT with the same inputs.        *
+#                                                                                                              *
+#***************************************************************************************************************
+
+
+
+import numpy as np
+from time import perf_counter
+from bin_by_thresholds import bin_by_thresholds
+from compute_class_histograms import compute_class_histograms
+from select_hellinger_split import select_hellinger_split
+from HellingerTreeNode import HellingerTreeNode
+
+
+_BATCH_CELLS = 1 << 24                                                                          # Bound on codes and histogram cells per batch
+
+
+
+def HDDT_breadth_first(features, labels, num_bins, cutoff, max_depth=None, max_leaf_nodes=None, columns=None, monitor=None):
+    timed = monitor is not None
+    labels = np.asarray(labels).reshape(-1)
+    columns = np.arange(features.shape[1]) if columns is None else np.asarray(columns)
+    order = np.arange(features.shape[0])                                                       # Shared row-index buffer, partitioned per node
+    model = HellingerTreeNode()
+    frontier = [(model, 0, features.shape[0])]
+    num_leaves = 1
+    depth = 0
+
+    while frontier:
+        # Nodes that are pure, small enough or at the depth limit become leaves
+        candidates = []
+        for node, start, end in frontier:
+            num_samples = end - start
+            num_positive = np.count_nonzero(labels[order[start:end]] == 1)
+            node.set_counts(num_samples, num_positive)
+            if num_positive == 0 or num_positive == num_samples or num_samples <= cutoff or \
+               (max_depth is not None and depth >= max_depth):
+                node.make_leaf()
+                if timed:
+                    monitor.record_node(depth, num_samples, True)
+            else:
+                candidates.append((node, start, end, num_positive))
+
+        # Evaluate the splits of the remaining nodes of this level in batches
+        next_frontier = []
+        for batch in _batches(candidates, len(columns), num_bins):
+            batch_start = perf_counter() if timed else 0
+            splits = _evaluate_level(features, labels, order, batch, columns, num_bins)
+            if timed:                                                                          # Share the batch time among its nodes by size
+                batch_seconds = perf_counter() - batch_start
+                batch_samples = sum(end - start for _, start, end, _ in batch)
+            for (node, start, end, num_positive), (feature, threshold, go_left) in zip(batch, splits):
+                node.feature = feature
+                node.threshold = threshold
+                num_samples = end - start
+                num_left = np.count_nonzero(go_left)
+                if timed:
+                    split_seconds = batch_seconds * num_samples / batch_samples
+                    bytes_copied = num_samples * len(columns) * features.itemsize
+                if num_left == 0 or num_left == num_samples or \
+                   (max_leaf_nodes is not None and num_leaves >= max_leaf_nodes):                    # Pure split or leaf budget used up
+                    node.make_leaf()
+                    if timed:
+                        monitor.record_node(depth, num_samples, True, split_seconds, bytes_copied=bytes_copied)
+                    continue
+
+                partition_start = perf_counter() if timed else 0
+                rows = order[start:end]
+                order[start:end] = np.concatenate((rows[go_left], rows[~go_left]))
+                if timed:
+                    monitor.record_node(depth, num_samples, False, split_seconds, perf_counter() - partition_start,
+                                        bytes_copied=bytes_copied + 2 * rows.nbytes)
+                node.left_branch = HellingerTreeNode()
+                node.right_branch = HellingerTreeNode()
+                node.complete = False
+                next_frontier.append((node.left_branch, start, start + num_left))
+                next_frontier.append((node.right_branch, start + num_left, end))
+                num_leaves += 1
+
+        frontier = next_frontier
+        depth += 1
+
+    return model
+
+
+
+def _batches(candidates, num_features, num_bins):
+    batch, cells = [], 0
+    for candidate in candidates:
+        size = max((candidate[2] - candidate[1]) * num_features, 2 * num_features * num_bins)
+        if batch and cells + size > _BATCH_CELLS:
+            yield batch
+            batch, cells = [], 0
+        batch.append(candidate)
+        cells += size
+    if batch:
+        yield batch
+
+
+
+def _evaluate_level(features, labels, order, batch, columns, num_bins):
+    num_nodes = len(batch)
+    num_features = len(columns)
+    sizes = np.array([end - start for _, start, end, _ in batch])
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    rows = np.concatenate([order[start:end] for _, start, end, _ in batch])
+    node_ids = np.repeat(np.arange(num_nodes), sizes)
+    values = features[np.ix_(rows, columns)]
+
+    # Per-node thresholds, generated exactly as compute_hellinger_distance_hist does for the node alone
+    min_vals = np.minimum.reduceat(values, offsets[:-1], axis=0)
+    max_vals = np.maximum.reduceat(values, offsets[:-1], axis=0)
+    thresholds = np.stack([np.linspace(min_vals[j], max_vals[j], num_bins + 1)[1:-1] for j in range(num_nodes)], axis=1)
+
+    # Bin every row against its own node's thresholds and build all node histograms at once
+    segments = node_ids[:, None] * num_features + np.arange(num_features)
+    codes = bin_by_thresholds(values, thresholds.reshape(num_bins - 1, num_nodes * num_features), segments)
+    histograms = compute_class_histograms(codes, labels[rows], num_bins, node_ids, num_nodes)
+    feature, _, threshold_index = select_hellinger_split(histograms)
+
+    splits = []
+    for j in range(num_nodes):
+        go_left = codes[offsets[j]:offsets[j + 1], feature[j]] <= threshold_index[j]
+        splits.append((feature[j], thresholds[threshold_index[j], j, feature[j]], go_left))
+    return splits
@@ -0,0 +1,80 @@
+#***************************************************************************************************************
+#                                                                                                              *
+#         This function implements the Hellinger Distance Decision Tree (HDDT) algorithm on scipy.sparse       *
+#       feature matrices. The matrix is kept in CSR form and never densified: every node gathers the stored    *
+#      entries of its own rows, the split search counts the zeros that are not stored per feature and class,   *
+#     and nodes own a range of one shared row-index buffer, which is partitioned in place when they are split. *
+#                 The resulting tree is the same as HDDT grows on the dense matrix with the same inputs.       *
+#                                                                                                              *
+#***************************************************************************************************************
+
+
+
+import numpy as np
+from time import perf_counter
+from compute_hellinger_distance_sparse import compute_hellinger_distance_sparse
+from HellingerTreeNode import HellingerTreeNode
+
+
+
+def HDDT_sparse(features, labels, model, num_bins, cutoff, rows=None, columns=None, monitor=None):
+    features = features.tocsr()                                                             # Rows are gathered from CSR, CSC is converted once
+    if columns is not None:
+        features = features[:, np.asarray(columns)]                                         # Node features index into the selected columns
+    labels = np.asarray(labels).reshape(-1)
+    order = np.arange(features.shape[0]) if rows is None else np.array(rows, dtype=np.intp) # Shared row-index buffer
+    _grow(features, labels, order, 0, order.shape[0], model, num_bins, cutoff, monitor, 0)
+    return model
+
+
+
+def _grow(features, labels, order, start, end, model, num_bins, cutoff, monitor, depth):
+    timed = monitor is not None
+    stack = [(model, start, end, depth)]                                                    # Sparse trees can be very deep, so no recursion
+    while stack:
+        model, start, end, depth = stack.pop()
+        rows = order[start:end]
+        num_samples = end - start
+        num_positive = np.count_nonzero(labels[rows] == 1)
+        model.set_counts(num_samples, num_positive)
+
+        # Check if all labels are the same or if the number of samples is below the cutoff
+        if num_positive == 0 or num_positive == num_samples or num_samples <= cutoff:
+            if timed:
+                monitor.record_node(depth, num_samples, True)
+            model.make_leaf()
+            continue
+
+        # Find the best feature and threshold from the stored entries of this node's rows
+        split_start = perf_counter() if timed else 0
+        node_features = features[rows]
+        feature, _, threshold = compute_hellinger_distance_sparse(node_features, labels[rows], num_bins)
+        model.threshold = threshold
+        model.feature = feature
+        if timed:
+            split_seconds = perf_counter() - split_start
+            partition_start = perf_counter()
+            bytes_copied = node_features.data.nbytes + node_features.indices.nbytes + node_features.indptr.nbytes
+
+        # Partition the node's range of the index buffer into left and right rows
+        go_left = node_features[:, feature].toarray().reshape(-1) <= threshold
+        num_left = np.count_nonzero(go_left)
+        del node_features
+        if num_left == 0 or num_left == num_samples:                                        # Check for pure split cases
+            if timed:
+                monitor.record_node(depth, num_samples, True, split_seconds, perf_counter() - partition_start, 0, bytes_copied)
+            model.make_leaf()
+            continue
+        order[start:end] = np.concatenate((rows[go_left], rows[~go_left]))
+        if timed:
+            monitor.record_node(depth, num_samples, False, split_seconds, perf_counter() - partition_start,
+                                bytes_copied=bytes_copied + 2 * rows.nbytes)
+
+        # Build the left branch first, then the right branch
+        model.left_branch = HellingerTreeNode()
+        model.right_branch = HellingerTreeNode()
+        model.complete = False
+        stack.append((model.right_branch, start + num_left, end, depth + 1))
+        stack.append((model.left_branch, start, start + num_left, depth + 1))
+
+    return model
@@ -0,0 +1,32 @@
+# This class defines a compiled Hellinger forest stored as one packed node table.
+# The nodes of all trees are concatenated into parallel arrays laid out like
+# HellingerTreeArrays, with child indices pointing into the packed table and
+# feature indices remapped to the columns of the original feature matrix.
+# roots[t] is the index of the root node of tree t, and the feature subset tree t
+# was trained on is feature_indices[feature_offsets[t]:feature_offsets[t + 1]].
+
+import numpy as np
+
+
+
+class HellingerForestArrays:
+    __slots__ = ("feature", "threshold", "left", "right", "label", "score", "roots", "feature_indices", "feature_offsets")
+
+    def __init__(self, feature, threshold, left, right, label, score, roots, feature_indices=(), feature_offsets=(0,)):
+        self.feature   = np.asarray(feature, dtype=np.intp)          # Original feature index per node, -1 for leaf nodes
+        self.threshold = np.asarray(threshold, dtype=np.float64)     # Split threshold per node
+        self.left      = np.asarray(left, dtype=np.intp)             # Packed index of the left child, -1 for leaf nodes
+        self.right     = np.asarray(right, dtype=np.intp)            # Packed index of the right child, -1 for leaf nodes
+        self.label = np.asarray(label, dtype=np.float64)             # Classification label of leaf nodes
+        self.score = np.asarray(score, dtype=np.float64)             # Confidence score for the label of leaf nodes
+        self.roots = np.asarray(roots, dtype=np.intp)                # Packed index of the root node of each tree
+        self.feature_indices = np.asarray(feature_indices, dtype=np.intp)  # Concatenated feature subsets of the trees
+        self.feature_offsets = np.asarray(feature_offsets, dtype=np.intp)  # Start of each tree's subset in feature_indices
+
+    @property
+    def num_trees(self):
+        return self.roots.shape[0]
+
+    @property
+    def num_nodes(self):
+        return self.feature.shape[0]
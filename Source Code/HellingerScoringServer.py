@@ -0,0 +1,200 @@
+# This class serves a trained Hellinger forest (or tree) to concurrent callers
+# on an asyncio event loop. Every call to score() submits one row; rows that
+# arrive together are collected into a micro-batch, closed when it holds
+# max_batch_size rows or max_wait_ms after its first row, and predicted with a
+# single call in a thread or process pool while the next batch is collected.
+# Request latencies and batch sizes of the most recent batches are kept for
+# the p50/p99 metrics. The row width is fixed by num_features or, without it,
+# derived from the model: rows must hold every column the model was trained on,
+# and trailing columns beyond those are ignored.
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from HellingerForestArrays import HellingerForestArrays
+from HellingerTreeArrays import HellingerTreeArrays
+from HellingerTreeNode import HellingerTreeNode
+from compile_Hellinger_forest import compile_Hellinger_forest
+from compile_Hellinger_tree import compile_Hellinger_tree
+from load_Hellinger_model import load_Hellinger_model
+from predict_Hellinger_forest import predict_Hellinger_forest
+from predict_Hellinger_tree import predict_Hellinger_tree
+
+
+
+class HellingerScoringServer:
+    def __init__(self, model, max_batch_size=64, max_wait_ms=2.0, workers=1, processes=False, window=10000, num_features=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be 1 or larger")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+        if workers < 1:
+            raise ValueError("workers must be 1 or larger")
+        self.path = model if isinstance(model, str) else None
+        self.model = _load_model(model)                       # Loaded and compiled once
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.workers = workers
+        self.processes = processes                            # Predict in worker processes instead of threads
+        self.min_features = _model_width(self.model)          # Columns the model reads
+        if num_features is not None and num_features < self.min_features:
+            raise ValueError(f"num_features is {num_features}, but the model uses {self.min_features} features")
+        self.num_features = num_features                      # Exact row length, or None to accept any row of min_features or more
+        self.num_requests = 0
+        self.num_batches = 0
+        self.latencies = deque(maxlen=window)                 # Seconds from submission to result, per request
+        self.batch_sizes = deque(maxlen=window)
+        self._queue = None
+        self._tasks = set()
+        self._slots = None
+        self._batcher = None
+        self._executor = None
+
+    async def start(self):
+        if self._batcher is not None:
+            return self
+        if self.processes:                                    # Every worker loads the model once; a file is memory-mapped again
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.path if self.path is not None else self.model,))
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)         # Batches in flight, one per worker
+        self._batcher = asyncio.get_running_loop().create_task(self._collect_batches())
+        return self
+
+    async def close(self):
+        if self._batcher is None:
+            return
+        self._batcher.cancel()
+        await asyncio.gather(self._batcher, *self._tasks, return_exceptions=True)
+        while not self._queue.empty():                        # Fail requests that never made it into a batch
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Scoring server closed"))
+        self._executor.shutdown(wait=True)
+        self._batcher = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def score(self, row):
+        """Score one row; returns the predicted label and the score of the positive class."""
+        if self._batcher is None:
+            raise RuntimeError("Scoring server is not started")
+        row = np.asarray(row, dtype=np.float64).reshape(-1)
+        if self.num_features is not None and row.shape[0] != self.num_features:
+            raise ValueError(f"Expected {self.num_features} features, got {row.shape[0]}")
+        if row.shape[0] < self.min_features:
+            raise ValueError(f"Expected at least {self.min_features} features, got {row.shape[0]}")
+        row = row[:self.min_features]                         # Same width for every row of a batch
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future, time.perf_counter()))
+        return await future
+
+    def metrics(self):
+        latencies = np.array(self.latencies) * 1000
+        batch_sizes = np.array(self.batch_sizes)
+        return {
+            "requests": self.num_requests,
+            "batches": self.num_batches,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies.size else None,
+            "latency_p99_ms": float(np.percentile(latencies, 99)) if latencies.size else None,
+            "batch_size_mean": float(batch_sizes.mean()) if batch_sizes.size else None,
+            "batch_size_p50": float(np.percentile(batch_sizes, 50)) if batch_sizes.size else None,
+            "batch_size_p99": float(np.percentile(batch_sizes, 99)) if batch_sizes.size else None,
+            "batch_size_max": int(batch_sizes.max()) if batch_sizes.size else None,
+        }
+
+    async def _collect_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()                       # Keep collecting while all workers are busy
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = loop.create_task(self._predict_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _predict_batch(self, batch):
+        try:
+            features = np.stack([row for row, _, _ in batch])
+            function = _predict_worker if self.processes else _predict
+            args = (features,) if self.processes else (self.model, features)
+            predicted_classes, predicted_scores = await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        except asyncio.CancelledError:                        # Server closing
+            for _, future, _ in batch:
+                future.cancel()
+            raise
+        except Exception as error:                            # Fail the whole batch, keep serving
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        finally:
+            self._slots.release()
+
+        finished = time.perf_counter()
+        for (_, future, submitted), label, score in zip(batch, predicted_classes[:, 0], predicted_scores[:, 0]):
+            self.latencies.append(finished - submitted)
+            if not future.done():                             # The caller may have been cancelled
+                future.set_result((int(label), float(score)))
+        self.num_requests += len(batch)
+        self.num_batches += 1
+        self.batch_sizes.append(len(batch))
+
+
+
+def _load_model(model):
+    if isinstance(model, str):
+        model = load_Hellinger_model(model)
+    if isinstance(model, HellingerTreeNode):
+        model = compile_Hellinger_tree(model)
+    if not isinstance(model, (HellingerForestArrays, HellingerTreeArrays)):
+        model = compile_Hellinger_forest(model)
+    return model
+
+
+
+def _model_width(model):
+    width = model.feature.max(initial=-1) + 1
+    if isinstance(model, HellingerForestArrays):
+        width = max(width, model.feature_indices.max(initial=-1) + 1)
+    return max(int(width), 1)
+
+
+
+def _predict(model, features):
+    if isinstance(model, HellingerTreeArrays):
+        return predict_Hellinger_tree(model, features)
+    return predict_Hellinger_forest(model, features)
+
+
+
+_worker = {}
+
+
+
+def _init_worker(model):
+    _worker["model"] = _load_model(model)
+
+
+
+def _predict_worker(features):
+    return _predict(_worker["model"], features)
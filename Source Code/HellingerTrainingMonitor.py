@@ -0,0 +1,67 @@
+# This class collects training statistics of Hellinger trees and forests.
+# The tree builders report every node they create: its depth, number of
+# samples, whether it became a leaf, the time spent in split search, in
+# partitioning the data and in computing the leaf label, and the number of
+# bytes copied. Per-tree totals are computed when a tree is finished, and
+# progress is published as event dictionaries to an optional callback.
+# Builders skip all measurements when no monitor is passed.
+
+from time import perf_counter
+
+
+
+class HellingerTrainingMonitor:
+    NODE_TOTALS = ("split_seconds", "partition_seconds", "leaf_seconds", "bytes_copied")
+
+    def __init__(self, callback=None, record_nodes=True):
+        self.callback = callback            # Called with every progress event dictionary
+        self.record_nodes = record_nodes    # Keep the per-node records, not only the per-tree totals
+        self.nodes = []                     # Per-node records
+        self.trees = []                     # Per-tree totals
+        self._tree = 0
+        self._totals = None
+        self._started = None
+
+    def emit(self, event):
+        if self.callback is not None:
+            self.callback(event)
+
+    def start_tree(self, tree, num_trees=1):
+        self._tree = tree
+        self._totals = dict.fromkeys(self.NODE_TOTALS, 0)
+        self._totals.update(num_nodes=0, num_leaves=0, max_depth=0)
+        self._started = perf_counter()
+        self.emit({"event": "tree_started", "tree": tree, "num_trees": num_trees})
+
+    def record_node(self, depth, num_samples, leaf, split_seconds=0.0, partition_seconds=0.0, leaf_seconds=0.0, bytes_copied=0):
+        if self._totals is None:
+            self.start_tree(self._tree)
+        record = {"tree": self._tree, "depth": depth, "num_samples": int(num_samples), "leaf": leaf,
+                  "split_seconds": split_seconds, "partition_seconds": partition_seconds,
+                  "leaf_seconds": leaf_seconds, "bytes_copied": int(bytes_copied)}
+        if self.record_nodes:
+            self.nodes.append(record)
+        for key in self.NODE_TOTALS:
+            self._totals[key] += record[key]
+        self._totals["num_nodes"] += 1
+        self._totals["num_leaves"] += leaf
+        self._totals["max_depth"] = max(self._totals["max_depth"], depth)
+
+    def finish_tree(self, num_trees=None):
+        totals = dict(self._totals or {}, tree=self._tree, seconds=perf_counter() - self._started if self._started else 0.0)
+        self.trees.append(totals)
+        self._totals = None
+        self._started = None
+        event = dict(totals, event="tree_finished")
+        if num_trees is not None:
+            event["num_trees"] = num_trees
+        self.emit(event)
+        return totals
+
+    def absorb(self, other, num_trees=1):
+        """Merge the records of a monitor filled in another process and publish its trees as a serial fit would."""
+        self.nodes.extend(other.nodes if self.record_nodes else ())
+        for totals in other.trees:
+            self.trees.append(totals)
+            self.emit({"event": "tree_started", "tree": totals["tree"], "num_trees": num_trees})
+            self.emit(dict(totals, event="tree_finished", num_trees=num_trees))
@@ -0,0 +1,24 @@
+# This class defines a compiled Hellinger decision tree stored as parallel arrays.
+# Node i splits on feature[i] at threshold[i] and continues at left[i] when the
+# feature value is less than or equal to the threshold and at right[i] otherwise.
+# Leaf nodes have feature -1 and store their classification label and score.
+# Node 0 is the root.
+
+import numpy as np
+
+
+
+class HellingerTreeArrays:
+    __slots__ = ("feature", "threshold", "left", "right", "label", "score")
+
+    def __init__(self, feature, threshold, left, right, label, score):
+        self.feature   = np.asarray(feature, dtype=np.intp)          # Feature index per node, -1 for leaf nodes
+        self.threshold = np.asarray(threshold, dtype=np.float64)     # Split threshold per node
+        self.left      = np.asarray(left, dtype=np.intp)             # Index of the left child, -1 for leaf nodes
+        self.right     = np.asarray(right, dtype=np.intp)            # Index of the right child, -1 for leaf nodes
+        self.label = np.asarray(label, dtype=np.float64)             # Classification label of leaf nodes
+        self.score = np.asarray(score, dtype=np.float64)             # Confidence score for the label of leaf nodes
+
+    @property
+    def num_nodes(self):
+        return self.feature.shape[0]
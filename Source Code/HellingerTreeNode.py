@@ -2,11 +2,21 @@
 # Each node can split data based on a feature and a threshold value, leading
 # to two branches (left and right). The node can also be marked as a leaf node
 # when it is complete, and in such cases, it will store a classification label 
-# and an associated score.
+# and an associated score. Every node also keeps the number of negative and
+# positive training instances that reached it, so leaves can be updated later.
+# Builders set the counts with set_counts and turn a node into a leaf with
+# make_leaf, which derives the label and score from the counts.
+# Nodes pickled before the class had __slots__ (or before counts existed) are
+# restored by __setstate__, with any missing attribute set to None.
+
+
+import numpy as np
 
 
 
 class HellingerTreeNode:
+    __slots__ = ("threshold", "feature", "left_branch", "right_branch", "complete", "label", "score", "counts")  # No per-node __dict__ for large trees
+
     def __init__(self):
         self.threshold = None           # Threshold value for the feature to split on
         self.feature   = None           # Feature index used for splitting the data
@@ -15,3 +25,20 @@ class HellingerTreeNode:
         self.complete  = False          # Indicator if the node is a leaf node
         self.label = None               # Classification label if node is a leaf
         self.score = None               # Confidence score for the label if node is a leaf
+        self.counts = None              # Numbers of negative and positive training instances in the node
+
+    def set_counts(self, num_samples, num_positive):
+        self.counts = np.array([num_samples - num_positive, num_positive])
+
+    def make_leaf(self):
+        num_negative, num_positive = self.counts
+        self.complete = True
+        self.label = 1 if num_positive > num_negative else 0          # Most frequent class, ties go to 0
+        self.score = num_positive / (num_negative + num_positive)
+        return self
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):                                # (__dict__, __slots__) state of slotted pickles
+            state = dict(state[0] or {}, **(state[1] or {}))
+        for name in self.__slots__:
+            setattr(self, name, state.get(name))
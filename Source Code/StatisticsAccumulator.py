@@ -0,0 +1,59 @@
+# This class accumulates the evaluation of a binary classifier over batches of
+# predictions, so streams of any length can be evaluated in bounded memory.
+# Hard predictions are reduced to the four confusion counts, and predicted
+# scores in [0, 1] to one histogram per class. Statistics and threshold curves
+# are computed from these counts; curve thresholds are the histogram bin edges,
+# and a score on an edge is counted in the bin that starts at that edge.
+
+import numpy as np
+from compute_threshold_curves import compute_threshold_curves
+
+
+
+class StatisticsAccumulator:
+    def __init__(self, num_bins=1000):
+        if num_bins < 1:
+            raise ValueError("num_bins must be 1 or larger")
+        self.num_bins = num_bins
+        self.edges = np.arange(num_bins) / num_bins                 # Lower edges of the score bins
+        self.true_positives = 0                                     # Confusion counts of the hard predictions
+        self.false_positives = 0
+        self.false_negatives = 0
+        self.true_negatives = 0
+        self.score_histograms = np.zeros((2, num_bins), dtype=np.int64)  # Scores of negative and positive instances per bin
+
+    def update(self, test_labels, predictions=None, predicted_scores=None):
+        """Add one batch of labels with their predicted labels and/or predicted scores."""
+        test_labels = np.asarray(test_labels).reshape(-1) == 1
+        if predictions is not None:
+            predictions = np.asarray(predictions).reshape(-1) == 1
+            if predictions.shape != test_labels.shape:
+                raise ValueError("Number of labels and predictions do not match")
+            self.true_positives += int(np.count_nonzero(test_labels & predictions))
+            self.false_positives += int(np.count_nonzero(~test_labels & predictions))
+            self.false_negatives += int(np.count_nonzero(test_labels & ~predictions))
+            self.true_negatives += int(np.count_nonzero(~test_labels & ~predictions))
+        if predicted_scores is not None:
+            predicted_scores = np.asarray(predicted_scores, dtype=np.float64).reshape(-1)
+            if predicted_scores.shape != test_labels.shape:
+                raise ValueError("Number of labels and scores do not match")
+            bins = np.clip(np.searchsorted(self.edges, predicted_scores, side="right") - 1, 0, self.num_bins - 1)
+            self.score_histograms += np.bincount(test_labels * self.num_bins + bins, minlength=2 * self.num_bins).reshape(2, self.num_bins)
+        return self
+
+    def statistics(self):
+        """Precision, recall and F1 score of the hard predictions, as returned by get_statistics."""
+        predicted_positive = self.true_positives + self.false_positives
+        actual_positive = self.true_positives + self.false_negatives
+        precision = self.true_positives / predicted_positive if predicted_positive else 1.0
+        recall = self.true_positives / actual_positive if actual_positive else 1.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return precision, recall, f1
+
+    def curves(self):
+        """Threshold curves of the scores, see compute_threshold_curves; thresholds are the bin edges in decreasing order."""
+        thresholds = self.edges[::-1]
+        false_positives = np.cumsum(self.score_histograms[0, ::-1])
+        true_positives = np.cumsum(self.score_histograms[1, ::-1])
+        num_negative, num_positive = self.score_histograms.sum(axis=1)
+        return compute_threshold_curves(thresholds, true_positives, false_positives, int(num_positive), int(num_negative))
@@ -0,0 +1,241 @@
+#****************************************************************************************************************************************************
+#                                                                                                                                                   *
+#       - This script benchmarks the fit and predict functions of Hellinger trees and forests on seeded synthetic data.                             *
+#       - Each case generates an imbalanced binary dataset and sweeps one of the number of instances, number of features, positive                  *
+#         class ratio, numBins, cutoff and numTrees around a base configuration.                                                                    *
+#       - Every case runs in its own process and records wall time, rows per second and peak resident memory of each operation.                     *
+#       - Results are written as JSON; the compare command flags slowdowns and memory growth against a saved baseline.                              *
+#                                                                                                                                                   *
+#       Usage:  python benchmark_Hellinger.py run --output results.json [--quick]                                                                   *
+#               python benchmark_Hellinger.py compare baseline.json results.json [--tolerance 0.2]                                                  *
+#                                                                                                                                                   *
+#****************************************************************************************************************************************************
+
+
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import numpy as np
+from fit_Hellinger_tree import fit_Hellinger_tree
+from fit_Hellinger_forest import fit_Hellinger_forest
+from predict_Hellinger_tree import predict_Hellinger_tree
+from predict_Hellinger_forest import predict_Hellinger_forest
+from make_dataset import make_dataset
+
+
+BASE_CASE = {"numInstances": 20000, "numFeatures": 20, "positiveRatio": 0.1, "numBins": 100, "cutoff": 10, "numTrees": 10}
+SWEEP = {
+    "numInstances": [5000, 20000, 80000],
+    "numFeatures": [10, 20, 40],
+    "positiveRatio": [0.01, 0.1, 0.3],
+    "numBins": [20, 100, 255],
+    "cutoff": [1, 10, 100],
+    "numTrees": [5, 10, 40],
+}
+QUICK_SCALE = {"numInstances": 0.1, "numTrees": 0.2}
+OPERATIONS = ("fit_tree", "fit_tree_globalBins", "predict_tree", "fit_forest", "fit_forest_globalBins", "predict_forest")
+CASE_KEYS = tuple(BASE_CASE)
+
+
+
+def make_cases(quick=False):
+    cases, seen = [], set()
+    for name, values in SWEEP.items():                                                                       # Vary one parameter at a time around the base case
+        for value in values:
+            case = dict(BASE_CASE, **{name: value})
+            if quick:
+                for key, scale in QUICK_SCALE.items():
+                    case[key] = max(1, int(case[key] * scale))
+            key = tuple(case[k] for k in CASE_KEYS)
+            if key not in seen:
+                seen.add(key)
+                cases.append(case)
+    return cases
+
+
+
+def _read_status(field):
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024                                        # Fallback: peak RSS of the process so far
+
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+
+def _measure(function, repeat):
+    best, result = None, None
+    _reset_peak_rss()
+    rss_before = _read_status("VmRSS")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, {"seconds": best, "rss_before_bytes": rss_before, "peak_rss_bytes": _read_status("VmHWM")}
+
+
+
+def run_case(case, repeat, seed):
+    features, labels = make_dataset(case["numInstances"], case["numFeatures"], case["positiveRatio"], seed)
+    numInstances = case["numInstances"]
+    records = []
+
+    def record(operation, function, rows):
+        result, measurement = _measure(function, repeat)
+        measurement["rows_per_second"] = rows / measurement["seconds"] if measurement["seconds"] > 0 else None
+        records.append(dict(case, operation=operation, **measurement))
+        return result
+
+    tree = record("fit_tree", lambda: fit_Hellinger_tree(features, labels, numBins=case["numBins"], cutoff=case["cutoff"]), numInstances)
+    record("fit_tree_globalBins", lambda: fit_Hellinger_tree(features, labels, numBins=case["numBins"], cutoff=case["cutoff"], globalBins=True),
+           numInstances)
+    record("predict_tree", lambda: predict_Hellinger_tree(tree, features), numInstances)
+    forest = record("fit_forest", lambda: fit_Hellinger_forest(features, labels, case["numTrees"], numBins=case["numBins"],
+                                                               cutoff=case["cutoff"], seed=seed), numInstances)
+    record("fit_forest_globalBins", lambda: fit_Hellinger_forest(features, labels, case["numTrees"], numBins=case["numBins"],
+                                                                 cutoff=case["cutoff"], seed=seed, globalBins=True), numInstances)
+    record("predict_forest", lambda: predict_Hellinger_forest(forest, features), numInstances)
+    return records
+
+
+
+def _case_worker(connection, case, repeat, seed):
+    try:
+        connection.send(("ok", run_case(case, repeat, seed)))
+    except Exception as error:                                                                              # Report the failure instead of hanging the parent
+        connection.send(("error", repr(error)))
+    connection.close()
+
+
+
+def run_benchmarks(quick=False, repeat=1, seed=0, log=sys.stderr):
+    """
+        Run every benchmark case in a separate process.
+
+        Parameters:
+            quick (bool, optional): Use smaller datasets and forests. Default: False.
+            repeat (int, optional): Number of timed repetitions; the fastest one is reported. Default: 1.
+            seed (int, optional)  : Seed of the datasets and forests. Default: 0.
+
+        Returns:
+            report (dict): Machine-readable results with environment metadata.
+    """
+
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    results = []
+    for case in make_cases(quick):
+        if log is not None:
+            print("Benchmarking " + ", ".join(f"{k}={case[k]}" for k in CASE_KEYS), file=log)
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_case_worker, args=(sender, case, repeat, seed))                  # Fresh process so peak RSS is per case
+        process.start()
+        sender.close()
+        status, payload = receiver.recv()
+        process.join()
+        if status != "ok":
+            raise RuntimeError(f"Benchmark case {case} failed: {payload}")
+        results.extend(payload)
+
+    return {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "quick": quick,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+
+def compare_benchmarks(baseline, current, tolerance=0.2):
+    """
+        Compare two benchmark reports.
+
+        Parameters:
+            baseline (dict)            : Report of the reference run.
+            current (dict)             : Report of the run under test.
+            tolerance (float, optional): Allowed relative increase of time and peak memory. Default: 0.2.
+
+        Returns:
+            regressions (list): One dict per operation and case that got slower or used more memory than allowed.
+    """
+
+    def key(result):
+        return (result["operation"],) + tuple(result[k] for k in CASE_KEYS)
+
+    reference = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = reference.get(key(result))
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_rss_bytes"):
+            if base[metric] and result[metric] > base[metric] * (1 + tolerance):
+                regressions.append({"operation": result["operation"], "case": {k: result[k] for k in CASE_KEYS},
+                                    "metric": metric, "baseline": base[metric], "current": result[metric],
+                                    "ratio": result[metric] / base[metric]})
+    return regressions
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Hellinger tree and forest fit/predict throughput and peak memory.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the benchmark sweep")
+    run.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    run.add_argument("--quick", action="store_true", help="use smaller datasets and forests")
+    run.add_argument("--repeat", type=int, default=1, help="timed repetitions per operation, fastest is kept")
+    run.add_argument("--seed", type=int, default=0, help="seed of datasets and forests")
+    compare = commands.add_parser("compare", help="flag regressions against a baseline report")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--tolerance", type=float, default=0.2, help="allowed relative increase, e.g. 0.2 for 20%%")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_benchmarks(args.quick, args.repeat, args.seed)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(report, file, indent=2)
+        else:
+            json.dump(report, sys.stdout, indent=2)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    regressions = compare_benchmarks(baseline, current, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression['operation']} {regression['metric']}: {regression['baseline']:.6g} -> "
+              f"{regression['current']:.6g} (x{regression['ratio']:.2f}) for {regression['case']}")
+    print(json.dumps({"regressions": len(regressions), "tolerance": args.tolerance}))
+    return 1 if regressions else 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#          This function maps feature values onto bin codes defined by sorted per-column thresholds.             *
+#        The code of a value is the number of thresholds strictly below it, so "code <= k" holds exactly         *
+#      when "value <= thresholds[k]". Codes are estimated arithmetically and then corrected with exact           *
+#                comparisons, which keeps the whole computation vectorized across columns.                       *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+
+
+def bin_by_thresholds(values, thresholds, segments=None):
+    """
+        Compute the bin code of every value against its column of thresholds.
+
+        Parameters:
+            values (numpy.ndarray)    : Array of feature values. If segments is None it must be an I x F matrix
+                                        whose columns correspond to the columns of thresholds.
+            thresholds (numpy.ndarray): K x S matrix of thresholds, sorted in increasing order within each column.
+            segments (numpy.ndarray)  : Optional integer array broadcastable to values giving the thresholds column
+                                        of each value. Default: the column index of values.
+
+        Returns:
+            codes (numpy.ndarray): Integer array shaped like values with codes in [0, K].
+    """
+
+    values = np.asarray(values)
+    num_thresholds = thresholds.shape[0]
+    if segments is None:
+        segments = np.arange(values.shape[-1])
+    segments = np.broadcast_to(segments, values.shape)
+    if num_thresholds == 0:
+        return np.zeros(values.shape, dtype=np.intp)
+
+    low = thresholds[0][segments]                                                           # Estimate the code from the threshold spacing
+    high = thresholds[-1][segments]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if num_thresholds > 1:
+            estimate = np.ceil((values - low) / ((high - low) / (num_thresholds - 1)))
+        else:
+            estimate = np.where(values > low, 1.0, 0.0)
+    estimate = np.where(np.isfinite(estimate), estimate, np.where(values > low, num_thresholds, 0))
+    estimate[np.isnan(values)] = num_thresholds                                              # NaN never satisfies value <= threshold
+    codes = np.clip(estimate, 0, num_thresholds).astype(np.intp)
+
+    # Correct the estimate with exact comparisons against the thresholds
+    flat_values = values.reshape(-1)
+    flat_segments = segments.reshape(-1)
+    flat_codes = codes.reshape(-1)
+    wrong = np.flatnonzero(flat_codes > 0)
+    while wrong.size:
+        wrong = wrong[flat_values[wrong] <= thresholds[flat_codes[wrong] - 1, flat_segments[wrong]]]
+        flat_codes[wrong] -= 1
+        wrong = wrong[flat_codes[wrong] > 0]
+    wrong = np.flatnonzero(flat_codes < num_thresholds)
+    while wrong.size:
+        wrong = wrong[flat_values[wrong] > thresholds[flat_codes[wrong], flat_segments[wrong]]]
+        flat_codes[wrong] += 1
+        wrong = wrong[flat_codes[wrong] < num_thresholds]
+
+    return codes
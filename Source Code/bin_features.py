@@ -0,0 +1,40 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function quantizes a feature matrix into compact bin codes. The bin edges of each feature are      *
+#      the equally spaced thresholds between its minimum and maximum, the same thresholds that the root node     *
+#       of a Hellinger tree evaluates. Codes are stored as uint8 or uint16 so the whole training matrix can      *
+#                           be kept once in memory and shared by every node of the tree.                         *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+from bin_by_thresholds import bin_by_thresholds
+
+
+def bin_features(features, num_bins, edges=None):
+    """
+        Quantize a feature matrix into bin codes.
+
+        Parameters:
+            features (numpy.ndarray): I x F numeric matrix where I is the number of instances and F is the number of features.
+            num_bins (int)          : Number of bins per feature. At most 65536.
+            edges (numpy.ndarray)   : Optional (num_bins - 1) x F matrix of bin edges to reuse, e.g. the edges of the training data.
+
+        Returns:
+            codes (numpy.ndarray): I x F matrix of bin codes. An instance with code <= k satisfies value <= edges[k].
+            edges (numpy.ndarray): (num_bins - 1) x F matrix of bin edges.
+    """
+
+    if num_bins > 65536:
+        raise ValueError("numBins must be at most 65536 for binned training")
+    if edges is None:
+        edges = np.linspace(np.min(features, axis=0), np.max(features, axis=0), num_bins + 1)[1:-1]
+
+    num_instances, num_features = features.shape
+    codes = np.empty((num_instances, num_features), dtype=np.uint8 if num_bins <= 256 else np.uint16)
+    block = max(1, (1 << 22) // max(1, num_instances))                                  # Bin in column blocks to bound the temporaries
+    for i in range(0, num_features, block):
+        codes[:, i:i + block] = bin_by_thresholds(features[:, i:i + block], edges[:, i:i + block])
+    return codes, edges
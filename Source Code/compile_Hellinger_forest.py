@@ -0,0 +1,51 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function compiles a Hellinger forest into a HellingerForestArrays model. Every tree is compiled    *
+#      into parallel arrays, its node features are remapped from the tree's feature subset to the columns of     *
+#      the original feature matrix, and the nodes of all trees are stacked into one packed node table, so the    *
+#                   whole ensemble can be traversed without selecting feature columns per tree.                  *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+from HellingerTreeArrays import HellingerTreeArrays
+from HellingerForestArrays import HellingerForestArrays
+from compile_Hellinger_tree import compile_Hellinger_tree
+
+
+def compile_Hellinger_forest(model):
+    """
+        Compile a trained Hellinger Distance Decision Forest into one packed node table.
+
+        Parameters:
+            model (list): A trained Hellinger Distance Decision Forest model. Each element of the list is a tuple
+                          (tree_model, feature_indices), where tree_model is a HellingerTreeNode or HellingerTreeArrays.
+
+        Returns:
+            forest (HellingerForestArrays): The same forest stored as a packed node table.
+    """
+
+    parts = {name: [] for name in ("feature", "threshold", "left", "right", "label", "score")}
+    roots, subsets = [], []
+    offset = 0
+    for tree_model, feature_indices in model:
+        tree = tree_model if isinstance(tree_model, HellingerTreeArrays) else compile_Hellinger_tree(tree_model)
+        feature_indices = np.asarray(feature_indices, dtype=np.intp)
+        is_split = tree.feature >= 0
+
+        roots.append(offset)
+        subsets.append(feature_indices)
+        parts["feature"].append(np.where(is_split, feature_indices[np.where(is_split, tree.feature, 0)], -1))   # Remap to original columns
+        parts["left"].append(np.where(is_split, tree.left + offset, -1))                                          # Shift into the packed table
+        parts["right"].append(np.where(is_split, tree.right + offset, -1))
+        parts["threshold"].append(tree.threshold)
+        parts["label"].append(tree.label)
+        parts["score"].append(tree.score)
+        offset += tree.num_nodes
+
+    arrays = {name: np.concatenate(values) if values else np.zeros(0) for name, values in parts.items()}
+    feature_offsets = np.concatenate(([0], np.cumsum([len(subset) for subset in subsets], dtype=np.intp)))
+    feature_indices = np.concatenate(subsets) if subsets else np.zeros(0, dtype=np.intp)
+    return HellingerForestArrays(roots=roots, feature_indices=feature_indices, feature_offsets=feature_offsets, **arrays)
@@ -0,0 +1,52 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#         This function compiles a tree of HellingerTreeNode objects into a HellingerTreeArrays model.           *
+#      Nodes are numbered in depth-first order with the root at index 0 and their split features, thresholds,    *
+#        children, labels and scores are written into parallel NumPy arrays that can be traversed for all       *
+#                                         instances at once.                                                     *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+from HellingerTreeArrays import HellingerTreeArrays
+
+
+def compile_Hellinger_tree(model, nodes=None):
+    """
+        Compile a trained Hellinger Distance Decision Tree into parallel arrays.
+
+        Parameters:
+            model (HellingerTreeNode): A trained Hellinger Distance Decision Tree model.
+            nodes (list, optional)   : If given, the HellingerTreeNode of every compiled node is appended to it in index order.
+
+        Returns:
+            tree (HellingerTreeArrays): The same tree stored as parallel arrays.
+    """
+
+    feature, threshold, left, right, label, score = [], [], [], [], [], []
+    stack = [(model, -1, False)]                                                                # Iterative depth-first walk, no recursion limit
+    while stack:
+        node, parent, is_right = stack.pop()
+        index = len(feature)
+        if nodes is not None:
+            nodes.append(node)
+        if parent >= 0:
+            (right if is_right else left)[parent] = index
+
+        left.append(-1)
+        right.append(-1)
+        if node.complete:
+            feature.append(-1)
+            threshold.append(0.0)
+            label.append(node.label)
+            score.append(node.score)
+        else:
+            feature.append(node.feature)
+            threshold.append(node.threshold)
+            label.append(0.0)
+            score.append(0.0)
+            stack.append((node.right_branch, index, True))
+            stack.append((node.left_branch, index, False))
+
+    return HellingerTreeArrays(feature, threshold, left, right, label, score)
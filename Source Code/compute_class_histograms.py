@@ -0,0 +1,39 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function counts, for every feature, how many negative and positive instances fall into each        *
+#     bin. Optionally the instances are grouped by node so that the histograms of many tree nodes are built      *
+#                         in a single bincount over the data instead of one pass per node.                       *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+
+
+def compute_class_histograms(codes, labels, num_bins, node_ids=None, num_nodes=1):
+    """
+        Build class-conditional bin counts.
+
+        Parameters:
+            codes (numpy.ndarray)   : I x F integer matrix of bin codes in [0, num_bins).
+            labels (numpy.ndarray)  : I x 1 matrix of 0/1 labels.
+            num_bins (int)          : Number of bins per feature.
+            node_ids (numpy.ndarray): Optional I x 1 matrix with the node in [0, num_nodes) of each instance.
+            num_nodes (int)         : Number of nodes referenced by node_ids.
+
+        Returns:
+            histograms (numpy.ndarray): 2 x F x num_bins matrix of counts, where index 0 holds the negative and index 1
+                                        the positive instances. With node_ids the result is num_nodes x 2 x F x num_bins.
+    """
+
+    num_features = codes.shape[1]
+    groups = np.asarray(labels).reshape(-1).astype(np.intp)
+    if node_ids is not None:
+        groups = groups + 2 * np.asarray(node_ids).reshape(-1).astype(np.intp)
+    flat = (groups[:, None] * num_features + np.arange(num_features)) * num_bins + codes
+    histograms = np.bincount(flat.reshape(-1), minlength=2 * num_nodes * num_features * num_bins)
+
+    if node_ids is None:
+        return histograms.reshape(2, num_features, num_bins)
+    return histograms.reshape(num_nodes, 2, num_features, num_bins)
@@ -11,9 +11,14 @@
 
 
 import numpy as np
+from scipy.sparse import issparse
+from compute_hellinger_distance_sparse import compute_hellinger_distance_sparse
 
 
 def compute_hellinger_distance(features, labels, num_bins):
+    if issparse(features):                                                    # Count the zeros that are not stored instead of densifying
+        return compute_hellinger_distance_sparse(features, labels, num_bins)
+
     # Compute the minimum and maximum values for each feature to determine bin sizes
     min_vals = np.min(features, axis=0)
     max_vals = np.max(features, axis=0)
@@ -25,7 +30,7 @@ def compute_hellinger_distance(features, labels, num_bins):
     
     # Generate threshold values for binning the feature values
     thresholds = np.linspace(min_vals, max_vals, num_bins + 1)[1:-1]
-    labels = np.expand_dims(labels, axis=1)
+    labels = np.reshape(labels, -1)                                           # Align labels with the feature column
     
     distances = []
     
@@ -0,0 +1,37 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#          This function is a histogram-based replacement for compute_hellinger_distance. Instead of four        *
+#      boolean-mask passes over a column for every threshold, each column is binned once against the same        *
+#      equally spaced thresholds, the per-class bin counts are built with one bincount, and the distances of     *
+#     all thresholds are obtained from cumulative sums. It returns the same feature, distance and threshold.     *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+from scipy.sparse import issparse
+from bin_by_thresholds import bin_by_thresholds
+from compute_class_histograms import compute_class_histograms
+from compute_hellinger_distance_sparse import compute_hellinger_distance_sparse
+from select_hellinger_split import select_hellinger_split
+
+
+def compute_hellinger_distance_hist(features, labels, num_bins):
+    if issparse(features):                                                   # Count the zeros that are not stored instead of densifying
+        return compute_hellinger_distance_sparse(features, labels, num_bins)
+
+    # Generate the same threshold values as compute_hellinger_distance
+    min_vals = np.min(features, axis=0)
+    max_vals = np.max(features, axis=0)
+    thresholds = np.linspace(min_vals, max_vals, num_bins + 1)[1:-1]
+
+    # Bin every column once and count the instances of each class per bin
+    codes = bin_by_thresholds(features, thresholds)
+    histograms = compute_class_histograms(codes, labels, num_bins)
+
+    # Evaluate all thresholds of all features from the cumulative bin counts
+    feature, distance, threshold_index = select_hellinger_split(histograms)
+    threshold = thresholds[threshold_index, feature]
+
+    return feature, distance, threshold
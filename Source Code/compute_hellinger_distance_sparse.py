@@ -0,0 +1,64 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#         This function is the scipy.sparse counterpart of compute_hellinger_distance_hist. Only the stored      *
+#      entries are binned; the zeros that are not stored are counted per feature and class from the number of    *
+#      stored entries and added to the bin of 0 in one step. Features without stored entries are constant zero   *
+#     and are not evaluated, so the work grows with the number of non-zeros and not with the matrix size. The    *
+#              thresholds and the selected feature, distance and threshold are those of the dense matrix.        *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+from bin_by_thresholds import bin_by_thresholds
+from compute_class_histograms import compute_class_histograms
+from select_hellinger_split import select_hellinger_split
+
+
+def compute_hellinger_distance_sparse(features, labels, num_bins):
+    features = features.tocsr()
+    num_instances, num_features = features.shape
+    labels = np.asarray(labels).reshape(-1)
+    entry_labels = labels[np.repeat(np.arange(num_instances), np.diff(features.indptr))]
+    columns, entry_columns, num_stored = np.unique(features.indices, return_inverse=True, return_counts=True)
+    num_active = columns.shape[0]
+    has_constant = num_active < num_features                                                # Some features are zero in every row
+    if num_active == 0:
+        return 0, 0.0, 0.0
+
+    # Range of every stored feature, including the zeros that are not stored
+    order = np.argsort(entry_columns, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(num_stored)[:-1]))
+    num_zeros = num_instances - num_stored
+    min_vals = np.minimum.reduceat(features.data[order], starts)
+    max_vals = np.maximum.reduceat(features.data[order], starts)
+    min_vals = np.where(num_zeros > 0, np.minimum(min_vals, 0), min_vals)
+    max_vals = np.where(num_zeros > 0, np.maximum(max_vals, 0), max_vals)
+
+    # Generate the thresholds as for the dense matrix; a constant column changes how linspace rounds all columns
+    if has_constant:
+        min_vals, max_vals = np.append(min_vals, 0), np.append(max_vals, 0)
+    thresholds = np.linspace(min_vals, max_vals, num_bins + 1)[1:-1, :num_active]
+
+    # Bin the stored entries, then add the zeros of each feature and class to the bin of 0
+    codes = bin_by_thresholds(features.data, thresholds, entry_columns)
+    histograms = compute_class_histograms(codes[:, None], entry_labels, num_bins, entry_columns, num_active)
+    histograms = np.ascontiguousarray(histograms[:, :, 0, :].transpose(1, 0, 2))
+    zero_codes = bin_by_thresholds(np.zeros(num_active), thresholds)
+    zero_positive = np.count_nonzero(labels == 1) - np.bincount(entry_columns, weights=entry_labels == 1, minlength=num_active).astype(np.int64)
+    histograms[0, np.arange(num_active), zero_codes] += num_zeros - zero_positive
+    histograms[1, np.arange(num_active), zero_codes] += zero_positive
+
+    feature, distance, threshold_index = select_hellinger_split(histograms)
+    threshold = thresholds[threshold_index, feature]
+    feature = np.intp(columns[feature])
+
+    # A constant feature has distance 0; on a tie at 0 the dense search takes the first feature
+    if has_constant and distance <= 0:
+        missing = np.flatnonzero(columns != np.arange(num_active))
+        first_constant = missing[0] if missing.size else num_active
+        if first_constant < feature:
+            feature, distance, threshold = first_constant, 0.0, 0.0
+
+    return feature, distance, threshold
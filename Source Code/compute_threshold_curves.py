@@ -0,0 +1,58 @@
+#********************************************************************************************************************************************************
+#                                                                                                                                                       *
+#             This function turns the cumulative confusion counts of a list of decreasing score thresholds into precision, recall and F1 score          *
+#        at every threshold, the ROC curve (false positive rate against true positive rate) and the precision-recall curve, together with the           *
+#       area under the ROC curve and the average precision. Edge cases are handled as in get_statistics: precision is 1.0 without positive              *
+#                                        predictions, recall is 1.0 without positive instances and F1 is 0.0 if both are zero.                          *
+#                                                                                                                                                       *
+#********************************************************************************************************************************************************
+
+
+
+import numpy as np
+
+
+def compute_threshold_curves(thresholds, true_positives, false_positives, num_positive, num_negative):
+    """
+        Compute threshold curves from cumulative confusion counts.
+
+        * Parameters:
+                    - thresholds (numpy.ndarray)     : Decreasing score thresholds; an instance is predicted positive if its score >= threshold.
+                    - true_positives (numpy.ndarray) : Number of positive instances predicted positive at each threshold.
+                    - false_positives (numpy.ndarray): Number of negative instances predicted positive at each threshold.
+                    - num_positive (int)             : Total number of positive instances.
+                    - num_negative (int)             : Total number of negative instances.
+
+        * Returns:
+                    - curves (dict): Arrays "thresholds", "true_positives", "false_positives", "precision", "recall", "f1",
+                                     "true_positive_rate" and "false_positive_rate", and the floats "roc_auc" and "average_precision".
+    """
+
+    true_positives = np.asarray(true_positives, dtype=np.float64)
+    false_positives = np.asarray(false_positives, dtype=np.float64)
+    predicted_positive = true_positives + false_positives
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted_positive > 0, true_positives / predicted_positive, 1.0)
+        recall = true_positives / num_positive if num_positive > 0 else np.ones_like(true_positives)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        false_positive_rate = false_positives / num_negative if num_negative > 0 else np.zeros_like(false_positives)
+
+    # Areas under the curves, starting from the point where nothing is predicted positive
+    roc_x = np.concatenate(([0.0], false_positive_rate))
+    roc_y = np.concatenate(([0.0], recall if num_positive > 0 else np.zeros_like(recall)))
+    roc_auc = float(np.sum(np.diff(roc_x) * (roc_y[1:] + roc_y[:-1]) / 2))
+    average_precision = float(np.sum(np.diff(roc_y) * precision))
+
+    return {
+        "thresholds": np.asarray(thresholds),
+        "true_positives": true_positives,
+        "false_positives": false_positives,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "true_positive_rate": recall,
+        "false_positive_rate": false_positive_rate,
+        "roc_auc": roc_auc,
+        "average_precision": average_precision,
+    }
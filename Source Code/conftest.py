@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+from compile_Hellinger_tree import compile_Hellinger_tree
+
+
+def _assert_same_tree(tree, expected):
+    tree, expected = compile_Hellinger_tree(tree), compile_Hellinger_tree(expected)
+    for name in ("feature", "threshold", "left", "right", "label", "score"):
+        np.testing.assert_array_equal(getattr(tree, name), getattr(expected, name), err_msg=name)
+
+
+@pytest.fixture
+def assert_same_tree():
+    """Assert that two trees have the same structure, splits, labels and scores."""
+    return _assert_same_tree
@@ -2,19 +2,62 @@
 #                                                                                                                *
 #         This function fits a Hellinger Forest, an ensemble of Hellinger Distance Decision Trees (HDDT).        *
 #         It randomly selects subsets of features for each tree to improve generalization and robustness.        *
+#   Trees can be grown in a pool of worker processes that attach to one shared copy of the training data, and    *
+#    every tree draws its features from its own seed so the forest does not depend on the number of workers.     *
 #                                                                                                                *
 #*****************************************************************************************************************
 
 
 
-import random
+import os
 import numpy as np
+from math import ceil
+from scipy.sparse import issparse
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
 from HDDT import HDDT
+from HDDT_binned import HDDT_binned
+from HDDT_breadth_first import HDDT_breadth_first
 from HellingerTreeNode import HellingerTreeNode
+from HellingerTrainingMonitor import HellingerTrainingMonitor
+from bin_features import bin_features
+from shared_array import share_array, attach_shared_array
 
 
 
-def fit_Hellinger_forest(features, labels, numTrees, numBins=100, minFeatureRatio=0.8, cutoff=None, printCount=False, memSplit=1, memThresh=1):
+def fit_Hellinger_forest(features, labels, numTrees, numBins=100, minFeatureRatio=0.8, cutoff=None, printCount=False, memSplit=1, memThresh=1,
+                         nJobs=1, seed=None, globalBins=False, maxDepth=None, maxLeafNodes=None, monitor=None,
+                         warmStart=None):
+    """
+    Train a Hellinger Distance Decision Forest.
+
+    Parameters:
+        features (numpy.ndarray)        : I x F numeric matrix where I is the number of instances and F is the number of features.
+                                          A numpy.memmap is shared with the workers by file name instead of being copied.
+                                          A scipy.sparse matrix is trained without densifying and shared as its CSR arrays.
+        labels (numpy.ndarray)          : I x 1 numeric matrix of 0/1 labels corresponding to the rows in features.
+        numTrees (int)                  : Number of trees to grow.
+        numBins (int, optional)         : Number of bins for discretizing numeric features. Default: 100.
+        minFeatureRatio (float, optional): Minimum fraction of the features that each tree is trained on. Default: 0.8.
+        cutoff (int, optional)          : Maximum number of instances in a leaf node. Default: 10 if more than ten instances, 1 otherwise.
+        printCount (bool, optional)     : Print the number of each tree as it is grown, from the monitor's progress events. Default: False.
+        memSplit (int, optional)        : Batch size for computing discretization splits, see fit_Hellinger_tree. Default: 1.
+        memThresh (int, optional)       : Minimum number of instances in a branch for batching the splits, see fit_Hellinger_tree. Default: 1.
+        nJobs (int, optional)           : Number of worker processes growing trees; -1 uses all CPUs. Default: 1.
+        seed (int, optional)            : Seed from which the per-tree seeds are derived. Default: None (not reproducible).
+        globalBins (bool, optional)     : Quantize the features once and grow every tree on the shared bin codes, see fit_Hellinger_tree. Default: False.
+        maxDepth (int, optional)        : Maximum depth of each tree; trees are grown breadth-first. Default: None (unlimited).
+        maxLeafNodes (int, optional)    : Maximum number of leaf nodes of each tree; trees are grown breadth-first. Default: None (unlimited).
+        monitor (HellingerTrainingMonitor, optional): Collects per-node and per-tree statistics and publishes tree_started/tree_finished
+                                          events; trees grown by workers are merged into it as they finish. Default: None.
+        warmStart (list, optional)      : An existing forest model trained on the same columns. Its trees are kept unchanged and numTrees
+                                          new trees are appended. With the same seed, tree i gets the same seed as in a single fit of all
+                                          trees. Default: None.
+
+    Returns:
+        model (list): List of (tree, reducedFeaturesIndices) tuples, one per tree, after the trees of warmStart.
+    """
+
     numInstances, numFeatures = features.shape
     if numInstances <= 1:                                                                                        # Check if the input feature matrix is valid
         raise ValueError("Feature array is empty or only instance exists")
@@ -23,6 +66,7 @@ def fit_Hellinger_forest(features, labels, numTrees, numBins=100, minFeatureRati
     if labels.shape[0] != numInstances:                                                                          # Check if the number of labels matches the number of instances
         raise ValueError("Number of instances in feature matrix and label matrix do not match")
     
+    labelIDs = np.unique(labels)                                                                                 # Ensure labels are binary (0 or 1)
     if len(labelIDs) != 2 or not (0 in labelIDs and 1 in labelIDs):
         raise ValueError("Labels must be either 0 or 1; Label array may only contain a single label value")
     if numBins < 1:                                                                                              # Validate the number of bins
@@ -31,18 +75,115 @@ def fit_Hellinger_forest(features, labels, numTrees, numBins=100, minFeatureRati
         raise ValueError("minFeatureRatio must be between (0 and 1]")
     if cutoff is None:                                                                                           # Set default cutoff value if not provided
         cutoff = 10 if numInstances > 10 else 1
-    
-    model = []
-    for i in range(numTrees):                                                                                    # Grow each tree in the forest
-        if printCount:
-            print(f"Growing Tree Number: {i+1}")
+    if nJobs == -1:
+        nJobs = os.cpu_count() or 1
+    if nJobs < 1:
+        raise ValueError("nJobs must be positive or -1")
+    if maxDepth is not None and maxDepth < 0:
+        raise ValueError("maxDepth must be non-negative")
+    if maxLeafNodes is not None and maxLeafNodes <= 0:
+        raise ValueError("maxLeafNodes must be positive")
+    if globalBins and (maxDepth is not None or maxLeafNodes is not None):
+        raise ValueError("globalBins cannot be combined with maxDepth or maxLeafNodes")
+    if issparse(features) and (globalBins or maxDepth is not None or maxLeafNodes is not None):
+        raise ValueError("Sparse features cannot be combined with globalBins, maxDepth or maxLeafNodes")
+    existing = list(warmStart) if warmStart is not None else []
+    if any(len(indices) and np.max(indices) >= numFeatures for _, indices in existing):                         # Check the warm-start trees fit the features
+        raise ValueError("warmStart model uses more features than the feature matrix has")
+
+    if printCount and monitor is None:                                                                           # Report progress through a monitor
+        monitor = HellingerTrainingMonitor(callback=_print_progress, record_nodes=False)
+    elif printCount:
+        monitor.callback = _chain(monitor.callback, _print_progress)
+
+    # Quantize once for all trees if the trees are grown on bin codes
+    edges = None
+    data = features.tocsr() if issparse(features) else features                                                  # Trees gather sparse rows from CSR
+    if globalBins:
+        start = perf_counter() if monitor is not None else 0
+        data, edges = bin_features(features, numBins)
+        if monitor is not None:
+            monitor.emit({"event": "binned", "seconds": perf_counter() - start, "bytes": data.nbytes})
+    labels = np.asarray(labels).reshape(-1)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(existing) + numTrees)[len(existing):]                         # One independent seed per tree
+    tree_offset = len(existing)
+    settings = (numFeatures, minFeatureRatio, numBins, cutoff, memThresh, memSplit, maxDepth, maxLeafNodes)
 
-        # Randomly select a subset of features for this tree
-        reducedFeaturesIndices = random.sample(range(numFeatures), random.randint(ceil(minFeatureRatio * numFeatures), numFeatures))
-        reducedFeatures = features[:, reducedFeaturesIndices]
+    model = existing
+    if nJobs == 1 or numTrees <= 1:
+        for i in range(numTrees):                                                                                # Grow each tree in the forest
+            if monitor is not None:
+                monitor.start_tree(tree_offset + i, tree_offset + numTrees)
+            model.append(_grow_tree(data, labels, edges, seeds[i], settings, monitor))
+            if monitor is not None:
+                monitor.finish_tree(tree_offset + numTrees)
+        return model
 
-        # Fit the tree with the selected features and add to the model
-        tree = HDDT(reducedFeatures, labels, HellingerTreeNode(), numBins, cutoff, memThresh, memSplit)
-        model.append((tree, reducedFeaturesIndices))
+    # Grow the trees in worker processes that attach to one shared copy of the data
+    descriptor, release = share_array(data)
+    try:
+        with ProcessPoolExecutor(max_workers=min(nJobs, numTrees), initializer=_init_worker,
+                                 initargs=(descriptor, labels, edges, settings, None if monitor is None else monitor.record_nodes)) as executor:
+            for tree, worker_monitor in executor.map(_grow_worker_tree, range(tree_offset, tree_offset + numTrees), seeds):
+                if monitor is not None:
+                    monitor.absorb(worker_monitor, tree_offset + numTrees)
+                model.append(tree)
+    finally:
+        release()
 
     return model
+
+
+
+def _grow_tree(data, labels, edges, seed, settings, monitor=None):
+    numFeatures, minFeatureRatio, numBins, cutoff, memThresh, memSplit, maxDepth, maxLeafNodes = settings
+
+    # Randomly select a subset of features for this tree from its own seed
+    rng = np.random.default_rng(seed)
+    numSelected = rng.integers(ceil(minFeatureRatio * numFeatures), numFeatures, endpoint=True)
+    reducedFeaturesIndices = rng.choice(numFeatures, numSelected, replace=False)
+
+    # Fit the tree on the selected columns; nodes only gather their own rows of them for the split search
+    if edges is None and (maxDepth is not None or maxLeafNodes is not None):
+        tree = HDDT_breadth_first(data, labels, numBins, cutoff, maxDepth, maxLeafNodes, columns=reducedFeaturesIndices, monitor=monitor)
+    elif edges is None:
+        tree = HDDT(data, labels, HellingerTreeNode(), numBins, cutoff, memThresh, memSplit, columns=reducedFeaturesIndices, monitor=monitor)
+    else:
+        tree = HDDT_binned(data, edges, labels, HellingerTreeNode(), numBins, cutoff, columns=reducedFeaturesIndices, monitor=monitor)
+    return tree, reducedFeaturesIndices
+
+
+
+_worker = {}
+
+
+
+def _init_worker(descriptor, labels, edges, settings, record_nodes):
+    data, handle = attach_shared_array(descriptor)
+    _worker.update(data=data, handle=handle, labels=labels, edges=edges, settings=settings, record_nodes=record_nodes)
+
+
+
+def _grow_worker_tree(index, seed):
+    record_nodes = _worker["record_nodes"]
+    monitor = None if record_nodes is None else HellingerTrainingMonitor(record_nodes=record_nodes)            # Local records, merged by the parent
+    if monitor is not None:
+        monitor.start_tree(index)
+    tree = _grow_tree(_worker["data"], _worker["labels"], _worker["edges"], seed, _worker["settings"], monitor)
+    if monitor is not None:
+        monitor.finish_tree()
+    return tree, monitor
+
+
+
+def _print_progress(event):
+    if event["event"] == "tree_finished" and "num_trees" in event:                                             # Same output for serial and parallel fits
+        print(f"Grown Tree Number: {event['tree']+1}")
+
+
+
+def _chain(first, second):
+    if first is None:
+        return second
+    return lambda event: (first(event), second(event))
@@ -14,18 +14,25 @@
 
 
 import numpy as np
-from scipy.stats import mode
+from scipy.sparse import issparse
 from HellingerTreeNode import HellingerTreeNode
 from HDDT import HDDT
+from HDDT_binned import HDDT_binned
+from HDDT_breadth_first import HDDT_breadth_first
+from bin_features import bin_features
+from compile_Hellinger_tree import compile_Hellinger_tree
+from time import perf_counter
 
 
-def fit_Hellinger_tree(features, labels, numBins=100, cutoff=None, memSplit=1, memThresh=1):
+def fit_Hellinger_tree(features, labels, numBins=100, cutoff=None, memSplit=1, memThresh=1, globalBins=False, flat=False,
+                       breadthFirst=False, maxDepth=None, maxLeafNodes=None, monitor=None):
     """
     Train a single Hellinger Distance Decision Tree.
     
     Parameters:
         features (numpy.ndarray) : I x F numeric matrix where I is the number of instances and F is the number of features.
                                    Each row represents one training instance and each column represents the value of one of its corresponding features.
+                                   May be a scipy.sparse matrix (CSC or CSR); it is split without densifying, with the recursive builder only.
         labels (numpy.ndarray)   : I x 1 numeric matrix where I is the number of instances. Each row is the label of a specific training instance 
                                    and corresponds to the same row in features.
         numBins (int, optional)  : Number of bins for discretizing numeric features. Default: 100.
@@ -33,9 +40,21 @@ def fit_Hellinger_tree(features, labels, numBins=100, cutoff=None, memSplit=1, m
         memSplit (int, optional) : If features matrix is large, compute discretization splits iteratively in batches of size memSplit instead all at once. Default: 1.
         memThresh (int, optional): If features matrix is large, compute discretization splits iteratively in batches of size memSplit only if number of instances in 
                                    branch is greater than memThresh. Default: 1.
+                                   memSplit and memThresh only batch over columns; for data larger than memory use fit_Hellinger_tree_streaming.
+        globalBins (bool, optional): If True, quantize the features once at the root into uint8/uint16 bin codes and let every node
+                                   evaluate the same bin edges, partitioning a shared row-index buffer instead of copying features.
+                                   memSplit and memThresh are not used in this mode. Default: False.
+        flat (bool, optional)    : If True, return the tree compiled into parallel arrays (HellingerTreeArrays). Default: False.
+        breadthFirst (bool, optional): If True, grow the tree level by level without recursion, evaluating the splits of all nodes
+                                   of a level together. Produces the same tree as the recursive builder. Default: False.
+        maxDepth (int, optional) : Maximum depth of the tree, the root having depth 0. Implies breadthFirst. Default: None (unlimited).
+        maxLeafNodes (int, optional): Maximum number of leaf nodes; nodes are split in breadth-first order until it is reached.
+                                   Implies breadthFirst. Default: None (unlimited).
+        monitor (HellingerTrainingMonitor, optional): Collects per-node statistics (depth, samples, split search, partition and leaf
+                                   time, bytes copied) and the tree totals, and publishes tree_started/tree_finished events. Default: None.
     
     Returns:
-        model (HellingerTreeNode): A trained Hellinger Distance Decision Tree model.
+        model (HellingerTreeNode or HellingerTreeArrays): A trained Hellinger Distance Decision Tree model.
     """
     
     numInstances, numFeatures = features.shape
@@ -46,7 +65,7 @@ def fit_Hellinger_tree(features, labels, numBins=100, cutoff=None, memSplit=1, m
     if labels.shape[0] != numInstances:                                                                             # Check if the number of labels matches the number of instances
         raise ValueError("Number of instances in feature matrix and label matrix do not match")
     
-        labelIDs = np.unique(labels)                                                                                    # Ensure labels are binary (0 or 1)
+    labelIDs = np.unique(labels)                                                                                    # Ensure labels are binary (0 or 1)
     if len(labelIDs) != 2 or not np.array_equal(labelIDs, [0, 1]):
         raise ValueError("Labels must be either 0 or 1; Label array may only contain a single label value")
     if cutoff is None:                                                                                              # Set default cutoff value if not provided
@@ -59,9 +78,33 @@ def fit_Hellinger_tree(features, labels, numBins=100, cutoff=None, memSplit=1, m
         raise ValueError("memSplit must be positive")
     if memThresh <= 0:
         raise ValueError("memThresh must be positive")
+    if maxDepth is not None and maxDepth < 0:
+        raise ValueError("maxDepth must be non-negative")
+    if maxLeafNodes is not None and maxLeafNodes <= 0:
+        raise ValueError("maxLeafNodes must be positive")
+    breadthFirst = breadthFirst or maxDepth is not None or maxLeafNodes is not None
+    if breadthFirst and globalBins:
+        raise ValueError("globalBins cannot be combined with breadthFirst, maxDepth or maxLeafNodes")
+    if issparse(features) and (globalBins or breadthFirst):
+        raise ValueError("Sparse features cannot be combined with globalBins, breadthFirst, maxDepth or maxLeafNodes")
 
     
+    if monitor is not None:
+        monitor.start_tree(0)
     model = HellingerTreeNode()                                                                                     # Initialize the model as a HellingerTreeNode
-    model = HDDT(features, labels, model, numBins, cutoff, memThresh, memSplit)                                     # Train the model using the HDDT algorithm
+    if globalBins:
+        start = perf_counter() if monitor is not None else 0
+        codes, edges = bin_features(features, numBins)                                                              # Quantize the features once for all nodes
+        if monitor is not None:
+            monitor.emit({"event": "binned", "seconds": perf_counter() - start, "bytes": codes.nbytes})
+        model = HDDT_binned(codes, edges, labels, model, numBins, cutoff, monitor=monitor)
+    elif breadthFirst:
+        model = HDDT_breadth_first(features, labels, numBins, cutoff, maxDepth, maxLeafNodes, monitor=monitor)      # Grow the tree level by level
+    else:
+        model = HDDT(features, labels, model, numBins, cutoff, memThresh, memSplit, monitor=monitor)                # Train the model using the HDDT algorithm
+    if monitor is not None:
+        monitor.finish_tree()
+    if flat:
+        return compile_Hellinger_tree(model)                                                                        # Emit the compiled array form
     return model
     
\ No newline at end of file
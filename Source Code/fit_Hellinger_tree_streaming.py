@@ -0,0 +1,209 @@
+#****************************************************************************************************************************************************
+#                                                                                                                                                   *
+#       - This function trains a single Hellinger Distance Decision Tree on data that does not fit in memory.                                       *
+#       - The rows are read in chunks, either from a numpy.memmap (or any array) with its labels, or from a source that yields                      *
+#         (features, labels) chunks and can be read several times.                                                                                 *
+#       - A first pass computes the minimum and maximum of every feature and the bin edges, which are the same as in pre-binned                     *
+#         training (fit_Hellinger_tree with globalBins=True).                                                                                       *
+#       - The tree is then grown level by level: each pass over the chunks routes every row to its node on the current level and                    *
+#         accumulates the class histograms of those nodes, from which all of their splits are selected at once.                                     *
+#       - Only the node of every row, one chunk and the histograms of one level are held in memory, so peak memory is set by                        *
+#         chunkSize and not by the size of the dataset.                                                                                             *
+#       - It returns the trained model, the same tree as pre-binned in-memory training on the same data.                                            *
+#                                                                                                                                                   *
+#****************************************************************************************************************************************************
+
+
+
+import numpy as np
+from HellingerTreeNode import HellingerTreeNode
+from bin_features import bin_features
+from compute_class_histograms import compute_class_histograms
+from select_hellinger_split import select_hellinger_split
+
+
+_HISTOGRAM_CELLS = 1 << 24                                                                                          # Bound on histogram cells per pass
+
+
+def fit_Hellinger_tree_streaming(source, labels=None, numBins=100, cutoff=None, chunkSize=65536, maxDepth=None):
+    """
+    Train a single Hellinger Distance Decision Tree by streaming over the rows.
+
+    Parameters:
+        source                   : Either an I x F numeric matrix such as a numpy.memmap, read chunkSize rows at a time, or a source of
+                                   (features, labels) chunks: a callable returning a new iterator, or a re-iterable object such as a list.
+                                   The data is read several times, so a one-shot iterator is not accepted.
+        labels (numpy.ndarray)   : I x 1 numeric matrix of 0/1 labels when source is a matrix; None when source yields labels. Default: None.
+        numBins (int, optional)  : Number of bins for discretizing numeric features. Default: 100.
+        cutoff (int, optional)   : Maximum number of instances in a leaf node. Default: 10 if more than ten instances, 1 otherwise.
+        chunkSize (int, optional): Number of rows read at a time when source is a matrix. Default: 65536.
+        maxDepth (int, optional) : Maximum depth of the tree, the root having depth 0. Default: None (unlimited).
+
+    Returns:
+        model (HellingerTreeNode): A trained Hellinger Distance Decision Tree model.
+    """
+
+    if numBins <= 0:                                                                                                # Validate input parameters
+        raise ValueError("numBins must be positive")
+    if chunkSize <= 0:
+        raise ValueError("chunkSize must be positive")
+    if maxDepth is not None and maxDepth < 0:
+        raise ValueError("maxDepth must be non-negative")
+    chunks = _chunk_reader(source, labels, chunkSize)
+
+    # First pass: count instances and labels and find the range of every feature
+    numInstances = 0
+    labelCounts = np.zeros(2, dtype=np.int64)
+    min_vals = max_vals = None
+    for features_chunk, labels_chunk in chunks():
+        if features_chunk.shape[0] != labels_chunk.shape[0]:                                                        # Check if the number of labels matches the number of instances
+            raise ValueError("Number of instances in feature matrix and label matrix do not match")
+        if not np.all((labels_chunk == 0) | (labels_chunk == 1)):                                                   # Ensure labels are binary (0 or 1)
+            raise ValueError("Labels must be either 0 or 1; Label array may only contain a single label value")
+        if features_chunk.shape[0] == 0:
+            continue
+        chunk_min = np.min(features_chunk, axis=0)
+        chunk_max = np.max(features_chunk, axis=0)
+        min_vals = chunk_min if min_vals is None else np.minimum(min_vals, chunk_min)
+        max_vals = chunk_max if max_vals is None else np.maximum(max_vals, chunk_max)
+        labelCounts += np.bincount(labels_chunk.astype(np.intp), minlength=2)
+        numInstances += features_chunk.shape[0]
+
+    if numInstances <= 1:                                                                                           # Check if the input feature matrix is valid
+        raise ValueError("Feature array is empty or only instance exists")
+    if min_vals.shape[0] == 0:
+        raise ValueError("No feature data")
+    if np.any(labelCounts == 0):
+        raise ValueError("Labels must be either 0 or 1; Label array may only contain a single label value")
+    if cutoff is None:                                                                                              # Set default cutoff value if not provided
+        cutoff = 10 if numInstances > 10 else 1
+    if cutoff <= 0:
+        raise ValueError("cutoff must be positive")
+    edges = np.linspace(min_vals, max_vals, numBins + 1)[1:-1]                                                      # Same bin edges as bin_features
+
+    # Grow the tree level by level; rows of finished nodes are marked -1
+    model = HellingerTreeNode()
+    model.counts = labelCounts
+    nodes, counts = [model], [labelCounts]
+    split_feature, split_code, left_id, right_id = [0], [0], [-1], [-1]
+    node_of_row = np.zeros(numInstances, dtype=np.int64)
+    frontier = [0] if _needs_split(labelCounts, cutoff, 0, maxDepth) else []
+    if not frontier:
+        model.make_leaf()
+    route = False
+    depth = 0
+
+    while frontier:
+        next_frontier = []
+        for group in _groups(frontier, min_vals.shape[0], numBins):
+            histograms = _accumulate(chunks, edges, numBins, node_of_row, group, len(nodes), route,
+                                     (split_feature, split_code, left_id, right_id))
+            route = False                                                                                           # Rows are routed during the first pass of a level only
+            feature, _, threshold_index = select_hellinger_split(histograms)
+
+            for j, node_id in enumerate(group):                                                                     # Turn every node of the group into a split or a leaf
+                node = nodes[node_id]
+                f, k = int(feature[j]), int(threshold_index[j])
+                node.feature = f
+                node.threshold = edges[k, f]
+                left_counts = histograms[j, :, f, :k + 1].sum(axis=-1)
+                right_counts = counts[node_id] - left_counts
+                if left_counts.sum() == 0 or right_counts.sum() == 0:                                                # Check for pure split cases
+                    node.make_leaf()
+                    continue
+
+                node.complete = False
+                node.left_branch = HellingerTreeNode()
+                node.right_branch = HellingerTreeNode()
+                split_feature[node_id], split_code[node_id] = f, k
+                children = []
+                for child, child_counts in ((node.left_branch, left_counts), (node.right_branch, right_counts)):
+                    child.counts = child_counts
+                    if _needs_split(child_counts, cutoff, depth + 1, maxDepth):
+                        children.append(len(nodes))
+                        next_frontier.append(len(nodes))
+                        nodes.append(child)
+                        counts.append(child_counts)
+                        split_feature.append(0)
+                        split_code.append(0)
+                        left_id.append(-1)
+                        right_id.append(-1)
+                    else:
+                        child.make_leaf()
+                        children.append(-1)
+                left_id[node_id], right_id[node_id] = children
+            del histograms
+
+        frontier = next_frontier
+        route = True
+        depth += 1
+
+    return model
+
+
+
+def _chunk_reader(source, labels, chunk_size):
+    if labels is not None:
+        if source.shape[0] != labels.shape[0]:
+            raise ValueError("Number of instances in feature matrix and label matrix do not match")
+
+        def chunks():
+            for start in range(0, source.shape[0], chunk_size):
+                yield np.asarray(source[start:start + chunk_size]), np.asarray(labels[start:start + chunk_size]).reshape(-1)
+        return chunks
+
+    if callable(source):
+        read = source
+    elif iter(source) is source:
+        raise ValueError("source is a one-shot iterator; pass a callable returning a new iterator of chunks instead")
+    else:
+        read = lambda: iter(source)
+
+    def chunks():
+        for features_chunk, labels_chunk in read():
+            yield np.asarray(features_chunk), np.asarray(labels_chunk).reshape(-1)
+    return chunks
+
+
+
+def _accumulate(chunks, edges, num_bins, node_of_row, group, num_nodes, route, tables):
+    num_features = edges.shape[1]
+    slot = np.full(num_nodes, -1, dtype=np.intp)
+    slot[group] = np.arange(len(group))
+    split_feature, split_code, left_id, right_id = (np.asarray(table) for table in tables)
+    histograms = np.zeros((len(group), 2, num_features, num_bins), dtype=np.int64)
+
+    offset = 0
+    for features_chunk, labels_chunk in chunks():
+        num_rows = features_chunk.shape[0]
+        ids = node_of_row[offset:offset + num_rows]
+        if ids.shape[0] != num_rows:
+            raise ValueError("source returned more rows than in the first pass")
+        codes = bin_features(features_chunk, num_bins, edges)[0]
+
+        active = np.flatnonzero(ids >= 0)
+        if route:                                                                                                   # Move rows from the nodes split last level to their children
+            parent = ids[active]
+            go_left = codes[active, split_feature[parent]] <= split_code[parent]
+            ids[active] = np.where(go_left, left_id[parent], right_id[parent])
+            active = active[ids[active] >= 0]
+
+        active = active[slot[ids[active]] >= 0]                                                                     # Accumulate the histograms of this group's nodes
+        histograms += compute_class_histograms(codes[active], labels_chunk[active], num_bins, slot[ids[active]], len(group))
+        offset += num_rows
+
+    if offset != node_of_row.shape[0]:
+        raise ValueError("source returned fewer rows than in the first pass")
+    return histograms
+
+
+
+def _groups(frontier, num_features, num_bins):
+    size = max(1, _HISTOGRAM_CELLS // (2 * num_features * num_bins))
+    for start in range(0, len(frontier), size):
+        yield frontier[start:start + size]
+
+
+
+def _needs_split(counts, cutoff, depth, max_depth):
+    return counts[0] > 0 and counts[1] > 0 and counts.sum() > cutoff and (max_depth is None or depth < max_depth)
@@ -28,19 +28,17 @@ def get_statistics(test_labels, predictions):
                     - f1 (float): F1 score.
     """
 
+    test_labels = np.asarray(test_labels).reshape(-1)                                   # Compare as flat arrays; I x 1 inputs would broadcast to I x I
+    predictions = np.asarray(predictions).reshape(-1)
+
     # Calculate precision
-    precision = np.sum(test_labels * predictions) / np.sum(predictions)
-    if np.sum(predictions) == 0:
-        precision = 1.0
+    true_positives = np.sum(test_labels * predictions)
+    precision = true_positives / np.sum(predictions) if np.sum(predictions) > 0 else 1.0
 
     # Calculate recall
-    recall = np.sum(test_labels * predictions) / np.sum(test_labels)
-    if np.sum(test_labels) == 0:
-        recall = 1.0
+    recall = true_positives / np.sum(test_labels) if np.sum(test_labels) > 0 else 1.0
 
     # Calculate F1 score
-    f1 = np.mean(2 * (precision * recall) / (precision + recall))
-    if precision + recall == 0:
-        f1 = 0.0
+    f1 = np.mean(2 * (precision * recall) / (precision + recall)) if precision + recall > 0 else 0.0
 
     return precision, recall, f1
@@ -0,0 +1,44 @@
+#********************************************************************************************************************************************************
+#                                                                                                                                                       *
+#            This function evaluates a binary classifier at every distinct score threshold at once. The predicted scores are sorted a single time,     *
+#        the numbers of true and false positives for every threshold are cumulative sums over the sorted labels, and precision, recall, F1 score,      *
+#          the ROC and precision-recall curves are derived from those counts. This replaces calling get_statistics once per threshold.                 *
+#                                                                                                                                                       *
+#********************************************************************************************************************************************************
+
+
+
+import numpy as np
+from compute_threshold_curves import compute_threshold_curves
+
+
+def get_threshold_statistics(test_labels, predicted_scores):
+    """
+        Calculate precision, recall, F1 score and ROC/PR curves for every distinct score threshold.
+
+        * Parameters:
+                    - test_labels (numpy.ndarray)     : Array of true 0/1 labels.
+                    - predicted_scores (numpy.ndarray): Array of predicted scores; an instance is predicted positive if its score >= threshold.
+
+        * Returns:
+                    - curves (dict): See compute_threshold_curves. The thresholds are the distinct scores in decreasing order.
+    """
+
+    test_labels = np.asarray(test_labels).reshape(-1)
+    predicted_scores = np.asarray(predicted_scores).reshape(-1)
+    if test_labels.shape[0] != predicted_scores.shape[0]:
+        raise ValueError("Number of labels and scores do not match")
+
+    order = np.argsort(-predicted_scores, kind="stable")                                         # Single sort by decreasing score
+    sorted_scores = predicted_scores[order]
+    sorted_labels = test_labels[order] == 1
+
+    # The last instance of every run of equal scores closes one threshold
+    last = np.flatnonzero(np.diff(sorted_scores))
+    if sorted_scores.shape[0]:
+        last = np.append(last, sorted_scores.shape[0] - 1)
+    true_positives = np.cumsum(sorted_labels)[last]
+    false_positives = last + 1 - true_positives
+
+    num_positive = int(np.count_nonzero(sorted_labels))
+    return compute_threshold_curves(sorted_scores[last], true_positives, false_positives, num_positive, sorted_labels.shape[0] - num_positive)
@@ -0,0 +1,58 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function loads a Hellinger tree or forest written by save_Hellinger_model. By default the file     *
+#      is memory-mapped read-only and the node arrays are views into the mapping, so loading takes constant      *
+#        time and every process that loads the same file shares one copy of the model in the page cache.         *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import json
+import struct
+import numpy as np
+from HellingerTreeArrays import HellingerTreeArrays
+from HellingerForestArrays import HellingerForestArrays
+from save_Hellinger_model import MAGIC, VERSION
+
+
+def load_Hellinger_model(path, mmap=True):
+    """
+        Load a Hellinger Distance Decision Tree or Forest saved with save_Hellinger_model.
+
+        Parameters:
+            path (str)           : Path of the model file.
+            mmap (bool, optional): Memory-map the file instead of reading it into memory. Default: True.
+
+        Returns:
+            model (HellingerTreeArrays or HellingerForestArrays): The compiled model, ready for predict_Hellinger_tree
+                                                                 or predict_Hellinger_forest.
+    """
+
+    with open(path, "rb") as file:
+        magic = file.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError("Not a Hellinger model file")
+        version, header_length = struct.unpack("<II", file.read(8))
+        if version != VERSION:
+            raise ValueError(f"Unsupported Hellinger model file version {version}")
+        header = json.loads(file.read(header_length).decode("utf-8"))
+
+    data_start = len(MAGIC) + 8 + header_length
+    if mmap:
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        data = np.fromfile(path, dtype=np.uint8)
+
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        start = data_start + entry["offset"]
+        arrays[name] = data[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+
+    if header["kind"] == "forest":
+        return HellingerForestArrays(**arrays)
+    if header["kind"] == "tree":
+        return HellingerTreeArrays(**arrays)
+    raise ValueError(f"Unknown Hellinger model kind {header['kind']}")
@@ -0,0 +1,34 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function generates a seeded imbalanced binary dataset for benchmarks and tests. A quarter of       *
+#         the features are informative: the positive instances are shifted on them by a random amount.           *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+
+
+def make_dataset(numInstances, numFeatures, positiveRatio, seed=0):
+    """
+        Generate a seeded imbalanced binary dataset.
+
+        Parameters:
+            numInstances (int)    : Number of instances.
+            numFeatures (int)     : Number of features; a quarter of them (at least one) are informative.
+            positiveRatio (float) : Fraction of instances with label 1.
+            seed (int, optional)  : Seed of the generator. Default: 0.
+
+        Returns:
+            features (numpy.ndarray): numInstances x numFeatures matrix.
+            labels (numpy.ndarray)  : numInstances 0/1 labels.
+    """
+
+    rng = np.random.default_rng(seed)
+    labels = np.zeros(numInstances, dtype=np.int64)
+    labels[rng.choice(numInstances, max(1, round(positiveRatio * numInstances)), replace=False)] = 1
+    features = rng.normal(size=(numInstances, numFeatures))
+    informative = max(1, numFeatures // 4)
+    features[:, :informative] += labels[:, None] * rng.uniform(0.5, 1.5, size=informative)                    # Shift the positives on informative features
+    return features, labels
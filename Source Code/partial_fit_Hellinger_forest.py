@@ -0,0 +1,30 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function updates every tree of a trained Hellinger forest with a new batch of labelled data.       *
+#      The structure of the trees is kept; only the class counts of their nodes and the labels and scores of     *
+#                             their leaves change, see partial_fit_Hellinger_tree.                               *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+from partial_fit_Hellinger_tree import partial_fit_Hellinger_tree
+
+
+def partial_fit_Hellinger_forest(model, features, labels):
+    """
+        Update the leaf statistics of a trained Hellinger Distance Decision Forest with new data.
+
+        Parameters:
+            model (list)             : A trained Hellinger Distance Decision Forest model, a list of (tree_model, feature_indices)
+                                       tuples. The trees are updated in place.
+            features (numpy.ndarray) : I x F numeric matrix of new instances with the same columns as the training data.
+            labels (numpy.ndarray)   : I x 1 matrix of their 0/1 labels.
+
+        Returns:
+            model (list): The updated model.
+    """
+
+    for tree_model, feature_indices in model:
+        partial_fit_Hellinger_tree(tree_model, features, labels, feature_indices)
+    return model
@@ -0,0 +1,62 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function updates a trained Hellinger Distance Decision Tree with a new batch of labelled data      *
+#      without changing its structure. The instances are routed down the existing splits, their labels are       *
+#     added to the class counts of every node on their path, and the label and score of each leaf are derived    *
+#                         again from its updated counts, as if the leaf had been trained on all data.            *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+from HellingerTreeArrays import HellingerTreeArrays
+from compile_Hellinger_tree import compile_Hellinger_tree
+from traverse_Hellinger_arrays import traverse_Hellinger_arrays
+
+
+def partial_fit_Hellinger_tree(model, features, labels, feature_indices=None):
+    """
+        Update the leaf statistics of a trained Hellinger Distance Decision Tree with new data.
+
+        Parameters:
+            model (HellingerTreeNode)        : A trained Hellinger Distance Decision Tree model; it is updated in place.
+            features (numpy.ndarray)         : I x F numeric matrix of new instances.
+            labels (numpy.ndarray)           : I x 1 matrix of their 0/1 labels.
+            feature_indices (list, optional) : Columns of features the tree was trained on, as stored with forest trees.
+                                               Default: None (the tree uses the columns of features directly).
+
+        Returns:
+            model (HellingerTreeNode): The updated model.
+    """
+
+    labels = np.asarray(labels).reshape(-1)
+    if features.shape[0] != labels.shape[0]:                                                    # Check if the number of labels matches the number of instances
+        raise ValueError("Number of instances in feature matrix and label matrix do not match")
+    if not np.all((labels == 0) | (labels == 1)):                                               # Ensure labels are binary (0 or 1)
+        raise ValueError("Labels must be either 0 or 1")
+
+    nodes = []
+    tree = compile_Hellinger_tree(model, nodes)
+    if any(node.counts is None for node in nodes):
+        raise ValueError("Model was trained without class counts and cannot be updated")
+    if feature_indices is not None:                                                             # Route on the original columns without copying them
+        feature_indices = np.asarray(feature_indices, dtype=np.intp)
+        is_split = tree.feature >= 0
+        tree = HellingerTreeArrays(np.where(is_split, feature_indices[np.where(is_split, tree.feature, 0)], -1),
+                                   tree.threshold, tree.left, tree.right, tree.label, tree.score)
+
+    # Count the new instances per leaf and class, then add them up to the root
+    leaves = traverse_Hellinger_arrays(tree, features)
+    added = np.bincount(leaves * 2 + labels.astype(np.intp), minlength=2 * tree.num_nodes).reshape(-1, 2)
+    for index in range(tree.num_nodes - 1, -1, -1):                                             # Children come after their parent in depth-first order
+        if tree.feature[index] >= 0:
+            added[index] += added[tree.left[index]] + added[tree.right[index]]
+
+    for index in np.flatnonzero(added.any(axis=1)):
+        node = nodes[index]
+        node.counts = node.counts + added[index]
+        if node.complete:                                                                       # Derive the leaf label and score from the counts
+            node.make_leaf()
+
+    return model
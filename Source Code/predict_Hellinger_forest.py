@@ -3,28 +3,38 @@
 #            This function predicts labels and scores using a trained Hellinger Distance Decision Forest model.                *
 #       It aggregates predictions and scores from multiple decision trees in the forest and returns the majority-voted         *
 #                       predicted_classes and the average predicted_scores for positive labels.                                *
+#        All trees are stacked into one packed node table and traversed together for a block of rows at a time, and the        *
+#                majority vote is taken from the sum of the tree votes, so memory is bounded by the block size.                *
 #                                                                                                                              *
 #*******************************************************************************************************************************
 
 
 
 import numpy as np
-from scipy.stats import mode
+from scipy.sparse import issparse
+from HellingerForestArrays import HellingerForestArrays
+from compile_Hellinger_forest import compile_Hellinger_forest
+from traverse_Hellinger_arrays import traverse_Hellinger_arrays
 
 
-def predict_Hellinger_forest(model, features):
+def predict_Hellinger_forest(model, features, chunk_size=None, rows=None):
     """
         Predict labels using a trained Hellinger Distance Decision Forest.
         
         Parameters:
-            model (list): A trained Hellinger Distance Decision Forest model.
+            model (list or HellingerForestArrays): A trained Hellinger Distance Decision Forest model.
                         Each element of the list contains a tuple (tree_model, feature_indices),
                         where tree_model is a trained Hellinger Distance Decision Tree model
                         and feature_indices is a list of indices indicating which features were used for training the tree.
-            f
-            eatures (numpy.ndarray): I x F numeric matrix where I is the number of instances and F
+                        The list is compiled with compile_Hellinger_forest; pass the compiled model to skip this step.
+            features (numpy.ndarray): I x F numeric matrix where I is the number of instances and F
                                     is the number of features. Each row represents one training instance
                                     and each column represents the value of one of its corresponding features.
+                                    May be a numpy.memmap; only one block of rows is read at a time.
+                                    May be a scipy.sparse matrix; CSR is read directly, other formats are converted to CSR.
+            chunk_size (int, optional): Number of rows traversed together. Default: about one million row-tree pairs per block.
+            rows (numpy.ndarray, optional): Indices of the rows of features to predict, e.g. a test fold; only one block of
+                                    them is gathered at a time. Default: None (all rows).
         
         Returns:
             predicted_classes (numpy.ndarray): I x 1 matrix where each row represents a predicted label of the corresponding feature set.
@@ -32,22 +42,34 @@ def predict_Hellinger_forest(model, features):
     """
 
 
-    num_instances, num_features = features.shape
+    num_instances, num_features = features.shape if rows is None else (len(rows), features.shape[1])
     if num_instances <= 0:                                                                      # Check if the input feature matrix is valid
         raise ValueError("Feature array is empty or only one instance exists")
     if num_features == 0:
         raise ValueError("No feature data")
 
-    num_trees = len(model)
-    predictions = np.zeros((num_instances, num_trees))
-    scores = np.zeros((num_instances, num_trees))
-    for i in range(num_trees):                                                                  # Iterate through each tree in the forest
-        tree_model, feature_indices = model[i]
-        tree_features = features[:, feature_indices]
-        tree_predictions, tree_scores = predict_Hellinger_tree(tree_model, tree_features)
-        predictions[:, i] = tree_predictions
-        scores[:, i] = tree_scores
-
-    predicted_classes = mode(predictions, axis=1)[0]                                            # Determine majority voted predicted_classes and average predicted_scores
-    predicted_scores = np.mean(scores, axis=1)
+    if not isinstance(model, HellingerForestArrays):                                            # Stack all trees into one packed node table
+        model = compile_Hellinger_forest(model)
+    num_trees = model.num_trees
+    if chunk_size is None:
+        chunk_size = max(1, (1 << 20) // max(1, num_trees))
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if issparse(features):                                                                      # Blocks of rows are sliced from CSR
+        features = features.tocsr()
+
+    predicted_classes = np.zeros((num_instances, 1))
+    predicted_scores = np.zeros((num_instances, 1))
+    for start in range(0, num_instances, chunk_size):                                          # Traverse all trees for one block of rows at a time
+        block = features[start:start + chunk_size] if rows is None else features[rows[start:start + chunk_size]]
+        if not issparse(block):
+            block = np.asarray(block)
+        num_rows = block.shape[0]
+        entry_rows = np.repeat(np.arange(num_rows), num_trees)                                  # One entry per row and tree
+        leaves = traverse_Hellinger_arrays(model, block, entry_rows, np.tile(model.roots, num_rows)).reshape(num_rows, num_trees)
+
+        votes = np.sum(model.label[leaves], axis=1)                                             # Majority vote, ties go to 0 as with mode
+        predicted_classes[start:start + num_rows, 0] = 2 * votes > num_trees
+        predicted_scores[start:start + num_rows, 0] = np.mean(model.score[leaves], axis=1)      # Average predicted_scores
+
     return predicted_classes, predicted_scores
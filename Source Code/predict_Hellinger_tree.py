@@ -1,14 +1,17 @@
 #********************************************************************************************************************************************
 #                                                                                                                                           *
 #                 This function predicts labels and scores using a trained Hellinger Distance Decision Tree model.                          *
-#         It iterates through each instance in the input feature matrix and traverses the decision tree to predict the label                *
-#    and score for each instance. The predicted_classes array stores the predicted labels for each instance, and the predicted_scores       *
-#                  array stores the estimated probability of the corresponding instance having a positive label.                            *                
+#         A HellingerTreeNode model is first compiled into parallel arrays, and all instances are then routed through the tree level        *
+#   by level with vectorized gathers. The predicted_classes array stores the predicted labels for each instance, and the predicted_scores   *
+#                       array stores the estimated probability of the corresponding instance having a positive label.                       *
 #                                                                                                                                           *
 #********************************************************************************************************************************************
 
 
-import numpy as np
+from scipy.sparse import issparse
+from HellingerTreeArrays import HellingerTreeArrays
+from compile_Hellinger_tree import compile_Hellinger_tree
+from traverse_Hellinger_arrays import traverse_Hellinger_arrays
 
 
 def predict_Hellinger_tree(model, features):
@@ -16,10 +19,11 @@ def predict_Hellinger_tree(model, features):
         Predict labels using a trained Hellinger Distance Decision Tree.
         
         Parameters:
-            model (HellingerTreeNode): A trained Hellinger Distance Decision Tree model.
+            model (HellingerTreeNode or HellingerTreeArrays): A trained Hellinger Distance Decision Tree model, either as nodes or compiled.
             features (numpy.ndarray) : I x F numeric matrix where I is the number of instances and F
                                     is the number of features. Each row represents one training instance
                                     and each column represents the value of one of its corresponding features.
+                                    May be a scipy.sparse matrix; CSR is read directly, other formats are converted to CSR.
         
         Returns:
             predicted_classes (numpy.ndarray): I x 1 matrix where each row represents a predicted label of the corresponding feature set.
@@ -33,19 +37,13 @@ def predict_Hellinger_tree(model, features):
     if num_features == 0:
         raise ValueError("No feature data")
 
-    initial_model = model                                                                       # Initialize the initial model and prediction arrays
-    predicted_classes = np.zeros((num_instances, 1))
-    predicted_scores = np.zeros((num_instances, 1))
-    for i in range(num_instances):                                                              # Iterate through each instance in the feature matrix
-        model = initial_model
-        complete = model.complete
-        while not complete:                                                                     # Traverse the decision tree until a leaf node is reached
-            if features[i, model.feature] <= model.threshold:
-                model = model.left_branch
-            else:
-                model = model.right_branch
-            complete = model.complete
-        predicted_classes[i] = model.label                                                      # Assign the predicted label and score for the current instance
-        predicted_scores[i] = model.score
+    if not isinstance(model, HellingerTreeArrays):                                              # Compile node objects into parallel arrays
+        model = compile_Hellinger_tree(model)
+    if issparse(features):                                                                      # Entries are looked up by row
+        features = features.tocsr()
+
+    leaves = traverse_Hellinger_arrays(model, features)                                         # Route all instances to their leaf nodes at once
+    predicted_classes = model.label[leaves].reshape(-1, 1)                                      # Assign the predicted label and score of each leaf
+    predicted_scores = model.score[leaves].reshape(-1, 1)
 
     return predicted_classes, predicted_scores
@@ -0,0 +1,66 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#       This function saves a trained Hellinger tree or forest in a compact, versioned binary file. The model    *
+#     is compiled into its packed node arrays (and, for forests, the per-tree feature subsets), which are       *
+#      written as raw little-endian arrays after a small JSON header. Every array starts on a 64-byte boundary   *
+#             so load_Hellinger_model can memory-map the file and use the arrays without copying them.           *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import json
+import struct
+import numpy as np
+from HellingerTreeArrays import HellingerTreeArrays
+from HellingerForestArrays import HellingerForestArrays
+from compile_Hellinger_tree import compile_Hellinger_tree
+from compile_Hellinger_forest import compile_Hellinger_forest
+
+
+MAGIC = b"HDDTMODL"
+VERSION = 1
+ALIGNMENT = 64
+TREE_ARRAYS = ("feature", "threshold", "left", "right", "label", "score")
+FOREST_ARRAYS = TREE_ARRAYS + ("roots", "feature_indices", "feature_offsets")
+
+
+def save_Hellinger_model(path, model):
+    """
+        Save a trained Hellinger Distance Decision Tree or Forest.
+
+        Parameters:
+            path (str) : Path of the file to write.
+            model      : A tree (HellingerTreeNode or HellingerTreeArrays) or a forest (list of (tree_model, feature_indices)
+                         tuples or HellingerForestArrays).
+    """
+
+    if isinstance(model, (list, tuple)):
+        model = compile_Hellinger_forest(model)
+    elif not isinstance(model, (HellingerTreeArrays, HellingerForestArrays)):
+        model = compile_Hellinger_tree(model)
+    kind, names = ("forest", FOREST_ARRAYS) if isinstance(model, HellingerForestArrays) else ("tree", TREE_ARRAYS)
+
+    # Lay the arrays out one after another, each aligned for memory mapping
+    arrays = {}
+    entries = {}
+    offset = 0
+    for name in names:
+        array = getattr(model, name)
+        array = np.ascontiguousarray(array, dtype="<i8" if array.dtype.kind in "iu" else "<f8")
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        arrays[name] = array
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = json.dumps({"kind": kind, "arrays": entries}).encode("utf-8")
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+    header = header.ljust(data_start - len(MAGIC) - 8)
+
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<II", VERSION, len(header)))
+        file.write(header)
+        for name in names:
+            file.seek(data_start + entries[name]["offset"])
+            file.write(arrays[name].tobytes())
+        file.truncate(data_start + offset)
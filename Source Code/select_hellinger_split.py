@@ -0,0 +1,46 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function turns class-conditional bin counts into the Hellinger distance of every candidate         *
+#     split. The left-branch counts of all thresholds come from one cumulative sum over the bins, the right      *
+#      branch counts are the totals minus the left counts, and the feature and threshold that maximize the       *
+#                           distance are selected with the same tie-breaking as before.                          *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+
+
+def select_hellinger_split(histograms):
+    """
+        Select the split with the largest Hellinger distance.
+
+        Parameters:
+            histograms (numpy.ndarray): ... x 2 x F x B matrix of class-conditional bin counts, as produced by
+                                        compute_class_histograms. Any leading dimensions (e.g. nodes) are kept.
+
+        Returns:
+            feature (numpy.ndarray)  : Index of the selected feature.
+            distance (numpy.ndarray) : Hellinger distance of the selected split.
+            threshold (numpy.ndarray): Index of the selected threshold; instances with bin code <= threshold go left.
+    """
+
+    left = np.cumsum(histograms, axis=-1)[..., :-1]
+    total = np.sum(histograms, axis=-1, keepdims=True)
+    right = total - left
+
+    Tminus = total[..., 0, :, :]
+    Tplus = total[..., 1, :, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distances = (np.sqrt(left[..., 1, :, :] / Tplus) - np.sqrt(left[..., 0, :, :] / Tminus)) ** 2 + \
+                    (np.sqrt(right[..., 1, :, :] / Tplus) - np.sqrt(right[..., 0, :, :] / Tminus)) ** 2
+
+    # Take the first feature with the maximum distance and its first maximizing threshold
+    max_distances = np.max(distances, axis=-1)
+    feature = np.argmax(max_distances, axis=-1)
+    feature_distances = np.take_along_axis(distances, feature[..., None, None], axis=-2)[..., 0, :]
+    threshold = np.argmax(feature_distances, axis=-1)
+    distance = np.take_along_axis(max_distances, feature[..., None], axis=-1)[..., 0][()]
+
+    return feature, distance, threshold
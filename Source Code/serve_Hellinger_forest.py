@@ -0,0 +1,238 @@
+#****************************************************************************************************************************************************
+#                                                                                                                                                   *
+#       - This script serves a Hellinger forest saved with save_Hellinger_model to online clients that score one row per request.                   *
+#       - Requests are micro-batched by HellingerScoringServer, so the per-tree cost of predict_Hellinger_forest is paid once per batch.            *
+#       - The front end is minimal HTTP/1.1 with keep-alive on a TCP port or a Unix socket:                                                         *
+#               POST /score    with body {"features": [x1, ..., xF]}  ->  {"label": 0 or 1, "score": s}                                             *
+#               GET  /metrics                                         ->  request count, p50/p99 latency and batch sizes                            *
+#       - The load command is a local load generator that keeps a number of connections busy and reports client-side latencies.                    *
+#                                                                                                                                                   *
+#       Usage:  python serve_Hellinger_forest.py serve model.hddt [--port 8080 | --unix /tmp/hddt.sock] [--max-batch-size 64] [--max-wait-ms 2]    *
+#               python serve_Hellinger_forest.py load --features F [--port 8080 | --unix /tmp/hddt.sock] [--concurrency 32] [--requests 10000]      *
+#                                                                                                                                                   *
+#****************************************************************************************************************************************************
+
+
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import numpy as np
+from HellingerScoringServer import HellingerScoringServer
+
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+MAX_BODY_BYTES = 1 << 20
+
+
+
+async def handle_connection(server, reader, writer):
+    try:
+        while True:
+            request = await _read_request(reader)
+            if request is None:                                                                             # Client closed the connection
+                break
+            method, path, headers, body = request
+            status, payload = await _dispatch(server, method, path, body)
+            keep_alive = headers.get("connection", "").lower() != "close"
+            _write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ConnectionError("Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES:
+        raise ConnectionError("Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return parts[0], parts[1], headers, body
+
+
+
+async def _dispatch(server, method, path, body):
+    if path == "/metrics":
+        return (200, server.metrics()) if method == "GET" else (405, {"error": "use GET"})
+    if path != "/score":
+        return 404, {"error": "unknown path"}
+    if method != "POST":
+        return 405, {"error": "use POST"}
+    try:
+        features = json.loads(body)["features"]
+        label, score = await server.score(features)
+    except (ValueError, KeyError, TypeError) as error:                                                      # Bad JSON, missing field or wrong row length
+        return 400, {"error": str(error)}
+    except Exception as error:
+        return 500, {"error": repr(error)}
+    return 200, {"label": label, "score": score}
+
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write((f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1") + body)
+
+
+
+async def serve(model, host="127.0.0.1", port=8080, unix=None, max_batch_size=64, max_wait_ms=2.0, workers=1, processes=False, ready=None,
+                num_features=None):
+    """
+        Serve a Hellinger forest over HTTP until cancelled.
+
+        Parameters:
+            model (str, list or HellingerForestArrays): Path of a saved model file, or a trained or compiled forest.
+            host, port (optional)                    : TCP address to listen on when unix is None. Default: 127.0.0.1:8080.
+            unix (str, optional)                     : Path of a Unix socket to listen on instead. Default: None.
+            max_batch_size (int, optional)           : Maximum number of rows per micro-batch. Default: 64.
+            max_wait_ms (float, optional)            : Maximum time a batch waits for more rows after its first. Default: 2.0.
+            workers (int, optional)                  : Number of prediction workers, and batches in flight. Default: 1.
+            processes (bool, optional)               : Predict in worker processes instead of threads. Default: False.
+            ready (asyncio.Event, optional)          : Set once the server accepts connections. Default: None.
+            num_features (int, optional)             : Required row length. Default: None (at least the columns the model uses).
+    """
+
+    async with HellingerScoringServer(model, max_batch_size, max_wait_ms, workers, processes, num_features=num_features) as server:
+        handler = lambda reader, writer: handle_connection(server, reader, writer)
+        if unix is not None:
+            listener = await asyncio.start_unix_server(handler, path=unix)
+        else:
+            listener = await asyncio.start_server(handler, host, port)
+        async with listener:
+            if ready is not None:
+                ready.set()
+            await listener.serve_forever()
+
+
+
+async def _request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+
+async def run_load(num_features, host="127.0.0.1", port=8080, unix=None, concurrency=32, requests=10000, seed=0):
+    """
+        Score random rows against a running server and report client-side latencies with the server metrics.
+
+        Parameters:
+            num_features (int)         : Number of features per row.
+            host, port, unix (optional): Address of the server, as for serve.
+            concurrency (int, optional): Number of connections, each with one request in flight. Default: 32.
+            requests (int, optional)   : Total number of requests. Default: 10000.
+            seed (int, optional)       : Seed of the random rows. Default: 0.
+
+        Returns:
+            report (dict): Throughput, client p50/p99 latency, error count and the server's /metrics.
+    """
+
+    rows = np.random.default_rng(seed).normal(size=(requests, num_features)).tolist()
+    latencies, errors = [], [0]
+
+    async def open_connection():
+        if unix is not None:
+            return await asyncio.open_unix_connection(unix)
+        return await asyncio.open_connection(host, port)
+
+    async def client(indices):
+        reader, writer = await open_connection()
+        try:
+            for index in indices:
+                start = time.perf_counter()
+                status, _ = await _request(reader, writer, "POST", "/score", {"features": rows[index]})
+                latencies.append(time.perf_counter() - start)
+                errors[0] += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(range(c, requests, concurrency)) for c in range(min(concurrency, requests))))
+    seconds = time.perf_counter() - start
+
+    reader, writer = await open_connection()
+    _, metrics = await _request(reader, writer, "GET", "/metrics")
+    writer.close()
+    latencies = np.array(latencies) * 1000
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors[0],
+        "seconds": seconds,
+        "requests_per_second": requests / seconds if seconds > 0 else None,
+        "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies.size else None,
+        "latency_p99_ms": float(np.percentile(latencies, 99)) if latencies.size else None,
+        "server": metrics,
+    }
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a Hellinger forest with micro-batching, or load-test a running server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("serve", "serve a saved model"), ("load", "run the local load generator")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=8080)
+        command.add_argument("--unix", help="use this Unix socket path instead of TCP")
+    serve_command, load_command = commands.choices["serve"], commands.choices["load"]
+    serve_command.add_argument("model", help="model file written by save_Hellinger_model")
+    serve_command.add_argument("--max-batch-size", type=int, default=64)
+    serve_command.add_argument("--max-wait-ms", type=float, default=2.0)
+    serve_command.add_argument("--workers", type=int, default=1, help="prediction workers and batches in flight")
+    serve_command.add_argument("--processes", action="store_true", help="predict in worker processes instead of threads")
+    serve_command.add_argument("--features", type=int, help="required number of features per row")
+    load_command.add_argument("--features", type=int, required=True, help="number of features per row")
+    load_command.add_argument("--concurrency", type=int, default=32)
+    load_command.add_argument("--requests", type=int, default=10000)
+    load_command.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.model, args.host, args.port, args.unix, args.max_batch_size, args.max_wait_ms, args.workers, args.processes,
+                              num_features=args.features))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    report = asyncio.run(run_load(args.features, args.host, args.port, args.unix, args.concurrency, args.requests, args.seed))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if report["errors"] else 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        These functions share a read-only NumPy array with worker processes without pickling or copying it.     *
+#       A memory-mapped file is shared by its file name; any other array is copied once into a named shared      *
+#      memory block. Workers receive a small descriptor and attach to the same memory, so every process sees      *
+#                                          one copy of the data.                                                 *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import mmap
+import numpy as np
+from multiprocessing import shared_memory
+from scipy.sparse import csc_matrix, csr_matrix, issparse
+
+
+def share_array(array):
+    """
+        Place an array where worker processes can attach to it.
+
+        Parameters:
+            array (numpy.ndarray): The array to share. A numpy.memmap opened on a whole file is shared by file name.
+                                   A scipy.sparse CSR or CSC matrix is shared as its three arrays.
+
+        Returns:
+            descriptor (tuple): Picklable description of the shared array, to be passed to attach_shared_array.
+            release (callable): Frees the shared memory block once the workers are done.
+    """
+
+    if issparse(array):
+        if array.format not in ("csr", "csc"):
+            array = array.tocsr()
+        shared = [share_array(part) for part in (array.data, array.indices, array.indptr)]
+
+        def release_all():
+            for _, release in shared:
+                release()
+
+        return ("sparse", array.format, array.shape, [descriptor for descriptor, _ in shared]), release_all
+
+    if isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap) and array.filename is not None:
+        order = "F" if array.flags.f_contiguous and not array.flags.c_contiguous else "C"
+        return ("memmap", array.filename, array.dtype.str, array.shape, array.offset, order), lambda: None
+
+    array = np.asarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+
+    def release():
+        block.close()
+        block.unlink()
+
+    return ("shm", block.name, array.dtype.str, array.shape), release
+
+
+def attach_shared_array(descriptor):
+    """
+        Attach to an array shared with share_array.
+
+        Parameters:
+            descriptor (tuple): The descriptor returned by share_array.
+
+        Returns:
+            array (numpy.ndarray): Read-only view of the shared data, or a sparse matrix built on such views.
+            handle               : Object that must be kept alive while the array is in use.
+    """
+
+    if descriptor[0] == "sparse":
+        _, format, shape, descriptors = descriptor
+        parts, handles = zip(*(attach_shared_array(part) for part in descriptors))
+        matrix_class = csr_matrix if format == "csr" else csc_matrix
+        return matrix_class(parts, shape=shape, copy=False), handles
+
+    if descriptor[0] == "memmap":
+        _, filename, dtype, shape, offset, order = descriptor
+        array = np.memmap(filename, dtype=np.dtype(dtype), mode="r", shape=shape, offset=offset, order=order)
+        return array, array
+
+    _, name, dtype, shape = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    array.flags.writeable = False
+    return array, block
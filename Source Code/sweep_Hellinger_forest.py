@@ -0,0 +1,179 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function cross-validates Hellinger forests over a grid of numBins, cutoff and minFeatureRatio.     *
+#      The features are quantized once, into as many bins as the least common multiple of the numBins grid,      *
+#     and every coarser numBins is obtained by merging consecutive bins. Folds are index arrays into the one     *
+#     binned copy of the data, every fold and numBins/minFeatureRatio pair grows its trees once with the         *
+#      smallest cutoff, and larger cutoffs are evaluated by truncating those trees. The pairs are evaluated      *
+#                 in a pool of worker processes that attach to one shared copy of the data.                      *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import os
+import numpy as np
+from math import ceil
+from concurrent.futures import ProcessPoolExecutor
+from scipy.sparse import issparse
+from HDDT_binned import HDDT_binned
+from HellingerTreeNode import HellingerTreeNode
+from bin_features import bin_features
+from compile_Hellinger_forest import compile_Hellinger_forest
+from get_statistics import get_statistics
+from predict_Hellinger_forest import predict_Hellinger_forest
+from shared_array import share_array, attach_shared_array
+from truncate_Hellinger_tree import truncate_Hellinger_tree
+
+
+def sweep_Hellinger_forest(features, labels, numTrees=10, numBinsGrid=(100,), cutoffGrid=(10,), minFeatureRatioGrid=(0.8,), numFolds=5,
+                           folds=None, seed=None, nJobs=1):
+    """
+    Cross-validate Hellinger Distance Decision Forests over a grid of settings.
+
+    Parameters:
+        features (numpy.ndarray)            : I x F numeric matrix where I is the number of instances and F is the number of features.
+                                              A numpy.memmap is shared with the workers by file name instead of being copied.
+        labels (numpy.ndarray)              : I x 1 numeric matrix of 0/1 labels corresponding to the rows in features.
+        numTrees (int, optional)            : Number of trees in every forest. Default: 10.
+        numBinsGrid (list, optional)        : Values of numBins. The data is binned once into their least common multiple of bins,
+                                              which must be at most 65536. Default: (100,).
+        cutoffGrid (list, optional)         : Values of cutoff. Trees are grown with the smallest and truncated for the others. Default: (10,).
+        minFeatureRatioGrid (list, optional): Values of minFeatureRatio. Default: (0.8,).
+        numFolds (int, optional)            : Number of stratified cross-validation folds. Default: 5.
+        folds (list, optional)              : (train_indices, test_indices) pairs to use instead of stratified folds. Default: None.
+        seed (int, optional)                : Seed of the folds and of the per-tree seeds; every setting uses the same tree seeds, which
+                                              are those of fit_Hellinger_forest with this seed. Default: None (not reproducible).
+        nJobs (int, optional)               : Number of worker processes; -1 uses all CPUs. Default: 1.
+
+    Returns:
+        results (list): One dict per fold, numBins, minFeatureRatio and cutoff with the keys "fold", "numBins", "minFeatureRatio",
+                        "cutoff", "precision", "recall" and "f1" as computed by get_statistics on the test fold, and "num_nodes",
+                        the number of nodes in the forest. Bin edges are computed on all rows, so only the feature ranges of the
+                        test folds are seen in training, not their labels.
+    """
+
+    if issparse(features):
+        raise ValueError("Sparse features are not supported by the binned sweep")
+    numInstances, numFeatures = features.shape
+    if numInstances <= 1:                                                                                        # Check if the input feature matrix is valid
+        raise ValueError("Feature array is empty or only instance exists")
+    if numFeatures == 0:
+        raise ValueError("No feature data")
+    labels = np.asarray(labels).reshape(-1)
+    if labels.shape[0] != numInstances:                                                                          # Check if the number of labels matches the number of instances
+        raise ValueError("Number of instances in feature matrix and label matrix do not match")
+    labelIDs = np.unique(labels)                                                                                 # Ensure labels are binary (0 or 1)
+    if len(labelIDs) != 2 or not (0 in labelIDs and 1 in labelIDs):
+        raise ValueError("Labels must be either 0 or 1; Label array may only contain a single label value")
+    if numTrees < 1:
+        raise ValueError("numTrees must be 1 or larger")
+    numBinsGrid, cutoffGrid, minFeatureRatioGrid = (sorted(set(grid)) for grid in (numBinsGrid, cutoffGrid, minFeatureRatioGrid))
+    if not numBinsGrid or not cutoffGrid or not minFeatureRatioGrid:
+        raise ValueError("Every grid needs at least one value")
+    if numBinsGrid[0] < 1:                                                                                       # Validate the grids
+        raise ValueError("Number of bins must be 1 or larger")
+    if cutoffGrid[0] <= 0:
+        raise ValueError("cutoff must be positive")
+    if minFeatureRatioGrid[0] <= 0 or minFeatureRatioGrid[-1] > 1:
+        raise ValueError("minFeatureRatio must be between (0 and 1]")
+    fineBins = int(np.lcm.reduce(numBinsGrid))
+    if fineBins > 65536:
+        raise ValueError(f"The least common multiple of numBinsGrid is {fineBins}; it must be at most 65536")
+    if nJobs == -1:
+        nJobs = os.cpu_count() or 1
+    if nJobs < 1:
+        raise ValueError("nJobs must be positive or -1")
+
+    root = np.random.SeedSequence(seed)
+    seeds = root.spawn(numTrees)                                                                                 # Same tree seeds as fit_Hellinger_forest
+    if folds is None:
+        if numFolds < 2 or numFolds > numInstances:
+            raise ValueError("numFolds must be between 2 and the number of instances")
+        folds = _stratified_folds(labels, numFolds, np.random.default_rng(root.spawn(1)[0]))
+    folds = [(np.asarray(train, dtype=np.intp), np.asarray(test, dtype=np.intp)) for train, test in folds]
+
+    # Quantize once at the finest resolution; every task indexes into the same codes
+    codes, edges = bin_features(features, fineBins)
+    settings = (fineBins, tuple(cutoffGrid))
+    tasks = [(fold, numBins, ratio) for numBins in numBinsGrid for ratio in minFeatureRatioGrid for fold in range(len(folds))]
+
+    results = []
+    if nJobs == 1 or len(tasks) <= 1:
+        context = {"codes": codes, "features": features, "labels": labels, "edges": edges, "folds": folds, "seeds": seeds,
+                   "settings": settings}
+        for task in tasks:
+            results.extend(_evaluate_task(context, task))
+        return results
+
+    # Evaluate the tasks in worker processes that attach to one shared copy of the codes and features
+    codes_descriptor, release_codes = share_array(codes)
+    features_descriptor, release_features = share_array(features)
+    try:
+        with ProcessPoolExecutor(max_workers=min(nJobs, len(tasks)), initializer=_init_worker,
+                                 initargs=(codes_descriptor, features_descriptor, labels, edges, folds, seeds, settings)) as executor:
+            for rows in executor.map(_evaluate_worker_task, tasks):
+                results.extend(rows)
+    finally:
+        release_codes()
+        release_features()
+
+    return results
+
+
+
+def _stratified_folds(labels, num_folds, rng):
+    parts = [np.array_split(rng.permutation(np.flatnonzero(labels == label)), num_folds) for label in (0, 1)]
+    folds = []
+    for fold in range(num_folds):
+        test = np.sort(np.concatenate([part[fold] for part in parts]))                                          # Both classes in every fold
+        train = np.setdiff1d(np.arange(labels.shape[0]), test, assume_unique=True)
+        folds.append((train, test))
+    return folds
+
+
+
+def _evaluate_task(context, task):
+    fold, numBins, minFeatureRatio = task
+    fineBins, cutoffs = context["settings"]
+    codes, labels = context["codes"], context["labels"]
+    train, test = context["folds"][fold]
+    numFeatures = codes.shape[1]
+
+    # Grow the trees on the training rows with the smallest cutoff, merging fine bins into numBins bins
+    trees = []
+    for seed in context["seeds"]:
+        rng = np.random.default_rng(seed)                                                                        # Same feature subset as fit_Hellinger_forest
+        numSelected = rng.integers(ceil(minFeatureRatio * numFeatures), numFeatures, endpoint=True)
+        reducedFeaturesIndices = rng.choice(numFeatures, numSelected, replace=False)
+        tree = HDDT_binned(codes, context["edges"], labels, HellingerTreeNode(), numBins, cutoffs[0], rows=train,
+                           columns=reducedFeaturesIndices, merge=fineBins // numBins)
+        trees.append((tree, reducedFeaturesIndices))
+
+    # Truncate the trees for each larger cutoff in turn and score the test rows
+    rows = []
+    for cutoff in cutoffs:
+        trees = [(truncate_Hellinger_tree(tree, cutoff), indices) for tree, indices in trees]
+        model = compile_Hellinger_forest(trees)
+        predictions, _ = predict_Hellinger_forest(model, context["features"], rows=test)
+        precision, recall, f1 = get_statistics(labels[test], predictions)
+        rows.append({"fold": fold, "numBins": numBins, "minFeatureRatio": minFeatureRatio, "cutoff": cutoff,
+                     "precision": float(precision), "recall": float(recall), "f1": float(f1), "num_nodes": model.num_nodes})
+    return rows
+
+
+
+_worker = {}
+
+
+
+def _init_worker(codes_descriptor, features_descriptor, labels, edges, folds, seeds, settings):
+    codes, codes_handle = attach_shared_array(codes_descriptor)
+    features, features_handle = attach_shared_array(features_descriptor)
+    _worker.update(codes=codes, features=features, handles=(codes_handle, features_handle), labels=labels, edges=edges,
+                   folds=folds, seeds=seeds, settings=settings)
+
+
+
+def _evaluate_worker_task(task):
+    return _evaluate_task(_worker, task)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from HDDT import HDDT
+from HDDT_breadth_first import HDDT_breadth_first
+from HellingerTreeNode import HellingerTreeNode
+from compile_Hellinger_tree import compile_Hellinger_tree
+from make_dataset import make_dataset
+
+
+@pytest.mark.parametrize("num_bins, cutoff", [(10, 5), (100, 10), (7, 1)])
+def test_matches_recursive_HDDT(num_bins, cutoff, assert_same_tree):
+    features, labels = make_dataset(600, 6, 0.2, seed=num_bins)
+    features[:, 2] = np.round(features[:, 2])                                   # Tied values
+    labels = labels.reshape(-1, 1)
+
+    tree = HDDT_breadth_first(features, labels, num_bins, cutoff)
+    expected = HDDT(features, labels, HellingerTreeNode(), num_bins, cutoff, 1, 1)
+    assert_same_tree(tree, expected)
+
+
+def test_limits_depth_and_leaves():
+    features, labels = make_dataset(600, 6, 0.2, seed=1)
+    tree = compile_Hellinger_tree(HDDT_breadth_first(features, labels, 20, 1, max_depth=3))
+    depth = np.zeros(tree.num_nodes, dtype=int)
+    for node in range(tree.num_nodes):
+        if tree.feature[node] >= 0:
+            depth[[tree.left[node], tree.right[node]]] = depth[node] + 1
+    assert depth.max() <= 3
+
+    tree = compile_Hellinger_tree(HDDT_breadth_first(features, labels, 20, 1, max_leaf_nodes=7))
+    assert np.count_nonzero(tree.feature < 0) <= 7
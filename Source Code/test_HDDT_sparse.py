@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from HDDT import HDDT
+from HellingerTreeNode import HellingerTreeNode
+from compute_hellinger_distance_hist import compute_hellinger_distance_hist
+from compute_hellinger_distance_sparse import compute_hellinger_distance_sparse
+from predict_Hellinger_tree import predict_Hellinger_tree
+
+
+def _sparse_dataset(seed, density, nonnegative=False):
+    rng = np.random.default_rng(seed)
+    features = rng.normal(size=(400, 30)) * (rng.random((400, 30)) < density)
+    if nonnegative:
+        features = np.abs(features)
+    features[:, -1] = 0.0                                                       # A column without stored entries
+    labels = ((features[:, 0] + features[:, 1] + 0.5 * rng.normal(size=400)) > 0.3).astype(int).reshape(-1, 1)
+    return features, labels
+
+
+@pytest.mark.parametrize("density, nonnegative, num_bins", [(0.1, False, 100), (0.05, True, 20), (0.5, False, 7)])
+def test_split_search_matches_dense(density, nonnegative, num_bins):
+    features, labels = _sparse_dataset(1, density, nonnegative)
+    expected = compute_hellinger_distance_hist(features, labels, num_bins)
+    for matrix in (sp.csc_matrix(features), sp.csr_matrix(features)):
+        feature, distance, threshold = compute_hellinger_distance_sparse(matrix, labels, num_bins)
+        assert (feature, threshold) == (expected[0], expected[2])
+        assert distance == pytest.approx(expected[1], rel=1e-12, abs=1e-15)
+
+
+@pytest.mark.parametrize("density, nonnegative, num_bins", [(0.1, False, 100), (0.05, True, 20), (0.5, False, 7)])
+def test_tree_and_prediction_match_dense(density, nonnegative, num_bins, assert_same_tree):
+    features, labels = _sparse_dataset(2, density, nonnegative)
+    expected = HDDT(features, labels, HellingerTreeNode(), num_bins, 10, 1, 1)
+    tree = HDDT(sp.csc_matrix(features), labels, HellingerTreeNode(), num_bins, 10, 1, 1)
+    assert_same_tree(tree, expected)
+
+    predicted = predict_Hellinger_tree(tree, sp.csr_matrix(features))
+    for result, expected_result in zip(predicted, predict_Hellinger_tree(expected, features)):
+        np.testing.assert_array_equal(result, expected_result)
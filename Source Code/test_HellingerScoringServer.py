@@ -0,0 +1,40 @@
+import asyncio
+import numpy as np
+import pytest
+from make_dataset import make_dataset
+from fit_Hellinger_forest import fit_Hellinger_forest
+from predict_Hellinger_forest import predict_Hellinger_forest
+from HellingerScoringServer import HellingerScoringServer
+
+
+def _forest():
+    features, labels = make_dataset(400, 6, 0.2, seed=5)
+    return fit_Hellinger_forest(features, labels, 4, numBins=20, minFeatureRatio=1.0, seed=2, globalBins=True), features
+
+
+def test_short_first_row_does_not_fix_the_row_width():
+    model, features = _forest()
+    expected_classes, expected_scores = predict_Hellinger_forest(model, features[:20])
+
+    async def run():
+        async with HellingerScoringServer(model, max_batch_size=8, max_wait_ms=1) as server:
+            with pytest.raises(ValueError):
+                await server.score(features[0, :3])
+            return await asyncio.gather(*(server.score(row) for row in features[:20]))
+
+    results = asyncio.run(run())
+    assert results == [(int(label), score) for label, score in zip(expected_classes[:, 0], expected_scores[:, 0])]
+
+
+def test_num_features_is_enforced():
+    model, features = _forest()
+    with pytest.raises(ValueError):
+        HellingerScoringServer(model, num_features=3)
+
+    async def run():
+        async with HellingerScoringServer(model, num_features=6) as server:
+            with pytest.raises(ValueError):
+                await server.score(np.append(features[0], 0.0))
+            return await server.score(features[0])
+
+    assert asyncio.run(run())[0] in (0, 1)
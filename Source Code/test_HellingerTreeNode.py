@@ -0,0 +1,53 @@
+import pickle
+import sys
+import types
+import numpy as np
+import pytest
+from HellingerTreeNode import HellingerTreeNode
+from partial_fit_Hellinger_tree import partial_fit_Hellinger_tree
+
+
+class _DictNode:
+    """HellingerTreeNode as it was before __slots__ and counts, pickled under the same name."""
+
+    def __init__(self):
+        self.threshold = None
+        self.feature = None
+        self.left_branch = None
+        self.right_branch = None
+        self.complete = False
+        self.label = None
+        self.score = None
+
+
+def _pickle_as_dict_tree():
+    root, left, right = _DictNode(), _DictNode(), _DictNode()
+    root.feature, root.threshold, root.left_branch, root.right_branch = 0, 0.5, left, right
+    for leaf, label in ((left, 0), (right, 1)):
+        leaf.complete, leaf.label, leaf.score = True, label, float(label)
+    module = types.ModuleType("HellingerTreeNode")
+    module.HellingerTreeNode = _DictNode
+    _DictNode.__module__, _DictNode.__qualname__ = "HellingerTreeNode", "HellingerTreeNode"
+    saved = sys.modules["HellingerTreeNode"]
+    sys.modules["HellingerTreeNode"] = module
+    try:
+        return pickle.dumps(root)
+    finally:
+        sys.modules["HellingerTreeNode"] = saved
+
+
+def test_unpickles_nodes_saved_without_slots():
+    root = pickle.loads(_pickle_as_dict_tree())
+    assert isinstance(root, HellingerTreeNode)
+    assert (root.feature, root.threshold, root.counts) == (0, 0.5, None)
+    assert root.right_branch.complete and root.right_branch.label == 1
+    with pytest.raises(ValueError, match="without class counts"):
+        partial_fit_Hellinger_tree(root, np.zeros((2, 1)), np.array([0, 1]))
+
+
+def test_pickle_round_trip_keeps_slots():
+    node = HellingerTreeNode()
+    node.feature, node.threshold, node.counts = 3, 1.5, np.array([2, 5])
+    restored = pickle.loads(pickle.dumps(node))
+    assert (restored.feature, restored.threshold) == (3, 1.5)
+    np.testing.assert_array_equal(restored.counts, [2, 5])
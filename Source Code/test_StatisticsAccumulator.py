@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from StatisticsAccumulator import StatisticsAccumulator
+from get_statistics import get_statistics
+
+
+def _assert_curves_match_get_statistics(curves, labels, scores):
+    for threshold, precision, recall, f1 in zip(curves["thresholds"], curves["precision"], curves["recall"], curves["f1"]):
+        expected = get_statistics(labels, (scores >= threshold).astype(int))
+        np.testing.assert_allclose((precision, recall, f1), expected, rtol=1e-12, err_msg=f"threshold {threshold}")
+
+
+def test_scores_on_bin_edges_count_at_that_threshold():
+    labels = np.array([1, 0, 1, 0, 1, 0])
+    scores = np.array([0.29, 0.29, 0.57, 0.58, 0.28, 1.0])
+    curves = StatisticsAccumulator(num_bins=100).update(labels, predicted_scores=scores).curves()
+    at = np.flatnonzero(curves["thresholds"] == 0.29)[0]
+    assert (curves["true_positives"][at], curves["false_positives"][at]) == (2, 3)
+    _assert_curves_match_get_statistics(curves, labels, scores)
+
+
+@pytest.mark.parametrize("num_bins", [10, 100, 1000])
+def test_batches_match_a_single_pass(num_bins):
+    rng = np.random.default_rng(num_bins)
+    labels = (rng.random(2000) < 0.2).astype(int)
+    scores = rng.integers(0, num_bins + 1, 2000) / num_bins                            # Every score on a bin edge
+    scores[::3] = rng.random(len(scores[::3]))
+    predictions = (scores >= 0.5).astype(int)
+
+    single = StatisticsAccumulator(num_bins).update(labels, predictions, scores)
+    batched = StatisticsAccumulator(num_bins)
+    for start in range(0, 2000, 333):
+        batched.update(labels[start:start + 333].reshape(-1, 1), predictions[start:start + 333], scores[start:start + 333])
+
+    assert batched.statistics() == single.statistics() == get_statistics(labels, predictions)
+    np.testing.assert_array_equal(batched.score_histograms, single.score_histograms)
+    curves = batched.curves()
+    for name, values in single.curves().items():
+        np.testing.assert_array_equal(curves[name], values, err_msg=name)
+    _assert_curves_match_get_statistics(curves, labels, scores)
@@ -0,0 +1,10 @@
+from benchmark_Hellinger import BASE_CASE, OPERATIONS, compare_benchmarks, run_case
+
+
+def test_run_case_measures_every_operation():
+    case = dict(BASE_CASE, numInstances=300, numFeatures=5, numBins=10, cutoff=10, numTrees=2)
+    records = run_case(case, repeat=1, seed=0)
+    assert [record["operation"] for record in records] == list(OPERATIONS)
+    for record in records:
+        assert record["seconds"] >= 0 and record["peak_rss_bytes"] > 0
+    assert compare_benchmarks({"results": records}, {"results": records}) == []
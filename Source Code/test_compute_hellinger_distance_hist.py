@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from compute_hellinger_distance import compute_hellinger_distance
+from compute_hellinger_distance_hist import compute_hellinger_distance_hist
+
+
+def _random(rng):
+    return rng.normal(size=(120, 5))
+
+
+def _integer_ties(rng):
+    return rng.integers(0, 4, size=(120, 5)).astype(float)
+
+
+def _constant_column(rng):
+    features = rng.normal(size=(120, 5))
+    features[:, 0] = 2.5
+    features[:, 3] = 0.0
+    return features
+
+
+def _wide_range(rng):
+    return rng.normal(size=(120, 5)) * np.array([1e-9, 1.0, 1e6, 1e12, 1e-3]) + np.array([0.0, -1e8, 3.0, 1e15, 7.0])
+
+
+@pytest.mark.parametrize("make_features", [_random, _integer_ties, _constant_column, _wide_range])
+@pytest.mark.parametrize("num_bins", [2, 3, 10, 64])
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_compute_hellinger_distance(make_features, num_bins, seed):
+    rng = np.random.default_rng(seed)
+    features = make_features(rng)
+    labels = (rng.random((features.shape[0], 1)) < 0.3).astype(int)
+    labels[:2, 0] = [0, 1]                                                      # Both classes present
+
+    feature, distance, threshold = compute_hellinger_distance_hist(features, labels, num_bins)
+    expected_feature, expected_distance, expected_threshold = compute_hellinger_distance(features, labels, num_bins)
+
+    assert feature == expected_feature
+    assert distance == pytest.approx(expected_distance, rel=1e-12, abs=1e-15)
+    assert threshold == expected_threshold
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from make_dataset import make_dataset
+from HellingerTrainingMonitor import HellingerTrainingMonitor
+import fit_Hellinger_forest as forest_module
+from fit_Hellinger_forest import fit_Hellinger_forest
+from predict_Hellinger_forest import predict_Hellinger_forest
+from shared_array import share_array
+
+
+@pytest.mark.parametrize("nJobs", [1, 2])
+def test_print_count_is_the_same_for_serial_and_parallel_fits(capsys, nJobs):
+    features, labels = make_dataset(300, 4, 0.2, seed=1)
+    fit_Hellinger_forest(features, labels, 3, numBins=10, printCount=True, nJobs=nJobs, seed=0, globalBins=True)
+    assert capsys.readouterr().out.splitlines() == [f"Grown Tree Number: {tree}" for tree in (1, 2, 3)]
+
+
+@pytest.mark.parametrize("column_labels", [False, True])
+def test_default_builder_fits_forests(column_labels):
+    features, labels = make_dataset(400, 6, 0.2, seed=2)
+    model = fit_Hellinger_forest(features, labels.reshape(-1, 1) if column_labels else labels, 3, numBins=20, seed=0)
+    predicted_classes, predicted_scores = predict_Hellinger_forest(model, features)
+    assert len(model) == 3
+    assert set(np.unique(predicted_classes)) <= {0, 1}
+    assert np.all((predicted_scores >= 0) & (predicted_scores <= 1))
+
+
+@pytest.mark.parametrize("settings", [{}, {"globalBins": True}, {"maxDepth": 4}])
+def test_parallel_fit_matches_serial_fit(settings, assert_same_tree):
+    features, labels = make_dataset(400, 6, 0.2, seed=3)
+    serial = fit_Hellinger_forest(features, labels, 4, numBins=20, minFeatureRatio=0.5, seed=7, nJobs=1, **settings)
+    parallel = fit_Hellinger_forest(features, labels, 4, numBins=20, minFeatureRatio=0.5, seed=7, nJobs=2, **settings)
+    assert len(parallel) == len(serial)
+    for (tree, indices), (expected_tree, expected_indices) in zip(parallel, serial):
+        np.testing.assert_array_equal(indices, expected_indices)
+        assert_same_tree(tree, expected_tree)
+
+
+@pytest.mark.parametrize("record_nodes", [False, True])
+def test_parallel_fit_reports_like_serial_fit(record_nodes):
+    features, labels = make_dataset(300, 4, 0.2, seed=1)
+    monitors = []
+    for nJobs in (1, 2):
+        events = []
+        monitor = HellingerTrainingMonitor(callback=events.append, record_nodes=record_nodes)
+        fit_Hellinger_forest(features, labels, 3, numBins=10, nJobs=nJobs, seed=0, monitor=monitor)
+        monitors.append((monitor, [(event["event"], event.get("tree"), event.get("num_trees")) for event in events]))
+    (serial, serial_events), (parallel, parallel_events) = monitors
+    assert parallel_events == serial_events
+    assert len(parallel.nodes) == len(serial.nodes) == (sum(tree["num_nodes"] for tree in serial.trees) if record_nodes else 0)
+    assert [tree["num_nodes"] for tree in parallel.trees] == [tree["num_nodes"] for tree in serial.trees]
+
+
+def test_workers_only_record_nodes_when_asked():
+    features, labels = make_dataset(300, 4, 0.2, seed=1)
+    settings = (4, 0.8, 10, 10, 10000, 1, None, None)
+    descriptor, release = share_array(features)
+    try:
+        for record_nodes in (False, True):
+            forest_module._init_worker(descriptor, labels, None, settings, record_nodes)
+            _, monitor = forest_module._grow_worker_tree(0, np.random.SeedSequence(0))
+            assert monitor.record_nodes == record_nodes
+            assert len(monitor.nodes) == (monitor.trees[0]["num_nodes"] if record_nodes else 0)
+        forest_module._init_worker(descriptor, labels, None, settings, None)
+        assert forest_module._grow_worker_tree(0, np.random.SeedSequence(0))[1] is None
+    finally:
+        forest_module._worker.clear()
+        release()
+
+
+@pytest.mark.parametrize("settings", [{}, {"globalBins": True}])
+def test_warm_start_matches_fitting_all_trees_at_once(settings, assert_same_tree):
+    features, labels = make_dataset(400, 6, 0.2, seed=4)
+    first = fit_Hellinger_forest(features, labels, 2, numBins=20, minFeatureRatio=0.5, seed=11, **settings)
+    first_trees = list(first)
+    grown = fit_Hellinger_forest(features, labels, 3, numBins=20, minFeatureRatio=0.5, seed=11, warmStart=first, **settings)
+    expected = fit_Hellinger_forest(features, labels, 5, numBins=20, minFeatureRatio=0.5, seed=11, **settings)
+    assert len(grown) == len(expected) == 5
+    assert all(tree is kept for (tree, _), (kept, _) in zip(grown, first_trees))           # Warm-start trees are kept as they are
+    for (tree, indices), (expected_tree, expected_indices) in zip(grown, expected):
+        np.testing.assert_array_equal(indices, expected_indices)
+        assert_same_tree(tree, expected_tree)
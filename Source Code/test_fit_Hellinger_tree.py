@@ -0,0 +1,23 @@
+import numpy as np
+from make_dataset import make_dataset
+from fit_Hellinger_tree import fit_Hellinger_tree
+
+
+def test_flat_and_column_labels_give_the_same_tree(assert_same_tree):
+    features, labels = make_dataset(500, 5, 0.2, seed=4)
+    tree = fit_Hellinger_tree(features, labels, numBins=20, cutoff=5)
+    assert_same_tree(tree, fit_Hellinger_tree(features, labels.reshape(-1, 1), numBins=20, cutoff=5))
+    assert_same_tree(tree, fit_Hellinger_tree(features, labels, numBins=20, cutoff=5, memThresh=100, memSplit=3))
+
+
+def test_leaves_take_the_majority_class_of_their_counts():
+    features, labels = make_dataset(500, 5, 0.2, seed=5)
+    stack = [fit_Hellinger_tree(features, labels, numBins=20, cutoff=40)]
+    while stack:
+        node = stack.pop()
+        if not node.complete:
+            stack.extend((node.left_branch, node.right_branch))
+            continue
+        num_negative, num_positive = node.counts
+        assert node.label == (1 if num_positive > num_negative else 0)
+        assert node.score == num_positive / (num_negative + num_positive)
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from make_dataset import make_dataset
+from fit_Hellinger_tree import fit_Hellinger_tree
+from fit_Hellinger_tree_streaming import fit_Hellinger_tree_streaming
+
+
+@pytest.mark.parametrize("chunk_size", [1000, 97, 5000])
+def test_matches_pre_binned_training(chunk_size, assert_same_tree):
+    features, labels = make_dataset(3000, 8, 0.1, seed=4)
+    expected = fit_Hellinger_tree(features, labels, numBins=50, cutoff=10, globalBins=True)
+    tree = fit_Hellinger_tree_streaming(features, labels, numBins=50, cutoff=10, chunkSize=chunk_size)
+    assert_same_tree(tree, expected)
+
+
+def test_reads_chunk_sources(tmp_path, assert_same_tree):
+    features, labels = make_dataset(2000, 5, 0.2, seed=6)
+    path = tmp_path / "features.dat"
+    stored = np.memmap(path, dtype=np.float64, mode="w+", shape=features.shape)
+    stored[:] = features
+    stored.flush()
+    expected = fit_Hellinger_tree_streaming(np.memmap(path, dtype=np.float64, mode="r", shape=features.shape), labels, chunkSize=300)
+
+    chunks = [(features[start:start + 256], labels[start:start + 256]) for start in range(0, 2000, 256)]
+    assert_same_tree(fit_Hellinger_tree_streaming(chunks), expected)
+    assert_same_tree(fit_Hellinger_tree_streaming(lambda: iter(chunks)), expected)
+    with pytest.raises(ValueError):
+        fit_Hellinger_tree_streaming(iter(chunks))
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from compute_threshold_curves import compute_threshold_curves
+from get_statistics import get_statistics
+from get_threshold_statistics import get_threshold_statistics
+
+
+def _labels_and_scores(seed):
+    rng = np.random.default_rng(seed)
+    labels = (rng.random(300) < 0.3).astype(int)
+    scores = np.round(np.clip(0.3 * labels + rng.random(300) * 0.7, 0, 1), 2)          # Ties and scores on bin edges
+    return labels, scores
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_every_threshold_matches_get_statistics(seed):
+    labels, scores = _labels_and_scores(seed)
+    curves = get_threshold_statistics(labels.reshape(-1, 1), scores.reshape(-1, 1))
+    np.testing.assert_array_equal(curves["thresholds"], np.unique(scores)[::-1])
+    for index, threshold in enumerate(curves["thresholds"]):
+        predictions = (scores >= threshold).astype(int)
+        assert curves["true_positives"][index] == np.count_nonzero(predictions & labels)
+        assert curves["false_positives"][index] == np.count_nonzero(predictions & (1 - labels))
+        np.testing.assert_allclose((curves["precision"][index], curves["recall"][index], curves["f1"][index]),
+                                   get_statistics(labels, predictions), rtol=1e-12)
+
+
+def test_areas_match_pairwise_definitions():
+    labels, scores = _labels_and_scores(5)
+    curves = get_threshold_statistics(labels, scores)
+    positive, negative = scores[labels == 1], scores[labels == 0]
+    pairs = positive[:, None] - negative[None, :]
+    assert curves["roc_auc"] == pytest.approx(np.mean((pairs > 0) + 0.5 * (pairs == 0)), rel=1e-12)
+    precision_at_positive = [get_statistics(labels, scores >= score)[0] for score in positive]
+    assert curves["average_precision"] == pytest.approx(np.mean(precision_at_positive), rel=1e-12)
+
+
+def test_edge_cases_follow_get_statistics():
+    curves = compute_threshold_curves(np.array([0.5]), np.array([0]), np.array([0]), 0, 3)
+    assert (curves["precision"][0], curves["recall"][0], curves["f1"][0]) == get_statistics(np.zeros(3), np.zeros(3))
+    curves = get_threshold_statistics(np.array([0, 0]), np.array([0.2, 0.7]))
+    for index, threshold in enumerate(curves["thresholds"]):
+        expected = get_statistics(np.array([0, 0]), (np.array([0.2, 0.7]) >= threshold).astype(int))
+        assert (curves["precision"][index], curves["recall"][index], curves["f1"][index]) == expected
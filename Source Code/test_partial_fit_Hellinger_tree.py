@@ -0,0 +1,53 @@
+import copy
+import numpy as np
+import pytest
+from make_dataset import make_dataset
+from fit_Hellinger_forest import fit_Hellinger_forest
+from fit_Hellinger_tree import fit_Hellinger_tree
+from partial_fit_Hellinger_forest import partial_fit_Hellinger_forest
+from partial_fit_Hellinger_tree import partial_fit_Hellinger_tree
+
+
+def _nodes(tree):
+    stack, nodes = [tree], []
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        if not node.complete:
+            stack.extend((node.right_branch, node.left_branch))
+    return nodes
+
+
+def _cleared(tree):
+    tree = copy.deepcopy(tree)
+    for node in _nodes(tree):
+        node.counts = np.zeros(2, dtype=np.int64)
+        if node.complete:                                                       # Leaves that forget their training data
+            node.label, node.score = 0, 0.0
+    return tree
+
+
+def _assert_same_statistics(tree, expected):
+    nodes, expected_nodes = _nodes(tree), _nodes(expected)
+    assert len(nodes) == len(expected_nodes)
+    for node, expected_node in zip(nodes, expected_nodes):
+        np.testing.assert_array_equal(node.counts, expected_node.counts)
+        assert (node.complete, node.label, node.score) == (expected_node.complete, expected_node.label, expected_node.score)
+
+
+@pytest.mark.parametrize("settings", [{}, {"globalBins": True}])
+def test_refitting_cleared_tree_restores_its_leaves(settings):
+    features, labels = make_dataset(500, 5, 0.2, seed=9)
+    tree = fit_Hellinger_tree(features, labels, numBins=20, cutoff=10, **settings)
+    refitted = _cleared(tree)
+    partial_fit_Hellinger_tree(refitted, features[:200], labels[:200])
+    partial_fit_Hellinger_tree(refitted, features[200:], labels[200:].reshape(-1, 1))     # Updates add up over batches
+    _assert_same_statistics(refitted, tree)
+
+
+def test_refitting_cleared_forest_restores_its_leaves():
+    features, labels = make_dataset(500, 6, 0.2, seed=10)
+    forest = fit_Hellinger_forest(features, labels, 3, numBins=20, minFeatureRatio=0.5, seed=5)
+    refitted = partial_fit_Hellinger_forest([(_cleared(tree), indices) for tree, indices in forest], features, labels)
+    for (tree, _), (expected, _) in zip(refitted, forest):
+        _assert_same_statistics(tree, expected)
@@ -0,0 +1,28 @@
+import numpy as np
+from make_dataset import make_dataset
+from fit_Hellinger_forest import fit_Hellinger_forest
+from predict_Hellinger_forest import predict_Hellinger_forest
+
+
+def _forest():
+    features, labels = make_dataset(500, 6, 0.2, seed=3)
+    return fit_Hellinger_forest(features, labels, 5, numBins=20, seed=1, globalBins=True), features
+
+
+def test_chunked_prediction_matches_one_block():
+    model, features = _forest()
+    expected_classes, expected_scores = predict_Hellinger_forest(model, features, chunk_size=features.shape[0])
+    for chunk_size in (1, 7, 100, 499):
+        predicted_classes, predicted_scores = predict_Hellinger_forest(model, features, chunk_size=chunk_size)
+        np.testing.assert_array_equal(predicted_classes, expected_classes)
+        np.testing.assert_array_equal(predicted_scores, expected_scores)
+
+
+def test_chunked_prediction_of_selected_rows():
+    model, features = _forest()
+    rows = np.random.default_rng(0).permutation(features.shape[0])[:321]
+    expected_classes, expected_scores = predict_Hellinger_forest(model, features[rows], chunk_size=rows.shape[0])
+    for chunk_size in (1, 50, 100, 321):
+        predicted_classes, predicted_scores = predict_Hellinger_forest(model, features, chunk_size=chunk_size, rows=rows)
+        np.testing.assert_array_equal(predicted_classes, expected_classes)
+        np.testing.assert_array_equal(predicted_scores, expected_scores)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from compile_Hellinger_tree import compile_Hellinger_tree
+from make_dataset import make_dataset
+from fit_Hellinger_tree import fit_Hellinger_tree
+from predict_Hellinger_tree import predict_Hellinger_tree
+
+
+def _walk(model, features):
+    """The per-row node walk that predict_Hellinger_tree replaced."""
+    predicted_classes = np.zeros((features.shape[0], 1))
+    predicted_scores = np.zeros((features.shape[0], 1))
+    for i in range(features.shape[0]):
+        node = model
+        while not node.complete:
+            node = node.left_branch if features[i, node.feature] <= node.threshold else node.right_branch
+        predicted_classes[i] = node.label
+        predicted_scores[i] = node.score
+    return predicted_classes, predicted_scores
+
+
+def _thresholds(tree):
+    stack, splits = [tree], []
+    while stack:
+        node = stack.pop()
+        if not node.complete:
+            splits.append((node.feature, node.threshold))
+            stack.extend((node.left_branch, node.right_branch))
+    return splits
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_per_row_walk(seed):
+    features, labels = make_dataset(600, 6, 0.2, seed=seed)
+    tree = fit_Hellinger_tree(features, labels, numBins=15, cutoff=5)
+
+    rng = np.random.default_rng(seed)
+    test_features = make_dataset(400, 6, 0.2, seed=seed + 100)[0]
+    for row, (feature, threshold) in zip(rng.choice(400, 200, replace=False), _thresholds(tree) * 10):
+        test_features[row, feature] = threshold                                 # Values equal to a split threshold go left
+    test_features[rng.random(test_features.shape) < 0.05] = np.nan               # NaN fails every comparison and goes right
+
+    expected = _walk(tree, test_features)
+    for model in (tree, compile_Hellinger_tree(tree)):
+        for result, expected_result in zip(predict_Hellinger_tree(model, test_features), expected):
+            np.testing.assert_array_equal(result, expected_result)
+
+
+def test_sparse_features_match_per_row_walk():
+    features, labels = make_dataset(600, 6, 0.2, seed=7)
+    features[np.abs(features) < 0.8] = 0.0
+    tree = fit_Hellinger_tree(features, labels, numBins=15, cutoff=5)
+    expected = _walk(tree, features)
+    for result, expected_result in zip(predict_Hellinger_tree(tree, sp.csc_matrix(features)), expected):
+        np.testing.assert_array_equal(result, expected_result)
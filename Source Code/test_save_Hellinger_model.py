@@ -0,0 +1,54 @@
+import struct
+import numpy as np
+import pytest
+from HellingerForestArrays import HellingerForestArrays
+from HellingerTreeArrays import HellingerTreeArrays
+from make_dataset import make_dataset
+from fit_Hellinger_forest import fit_Hellinger_forest
+from fit_Hellinger_tree import fit_Hellinger_tree
+from load_Hellinger_model import load_Hellinger_model
+from predict_Hellinger_forest import predict_Hellinger_forest
+from predict_Hellinger_tree import predict_Hellinger_tree
+from save_Hellinger_model import MAGIC, VERSION, save_Hellinger_model
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return make_dataset(400, 6, 0.2, seed=8)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_tree_round_trip(tmp_path, dataset, mmap):
+    features, labels = dataset
+    tree = fit_Hellinger_tree(features, labels, numBins=20, cutoff=5)
+    save_Hellinger_model(tmp_path / "tree.hddt", tree)
+    loaded = load_Hellinger_model(tmp_path / "tree.hddt", mmap=mmap)
+    assert isinstance(loaded, HellingerTreeArrays)
+    for result, expected in zip(predict_Hellinger_tree(loaded, features), predict_Hellinger_tree(tree, features)):
+        np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_forest_round_trip(tmp_path, dataset, mmap):
+    features, labels = dataset
+    forest = fit_Hellinger_forest(features, labels, 4, numBins=20, minFeatureRatio=0.5, seed=3)
+    save_Hellinger_model(tmp_path / "forest.hddt", forest)
+    loaded = load_Hellinger_model(tmp_path / "forest.hddt", mmap=mmap)
+    assert isinstance(loaded, HellingerForestArrays)
+    for result, expected in zip(predict_Hellinger_forest(loaded, features), predict_Hellinger_forest(forest, features)):
+        np.testing.assert_array_equal(result, expected)
+
+
+def test_rejects_other_files_and_versions(tmp_path, dataset):
+    features, labels = dataset
+    path = tmp_path / "tree.hddt"
+    save_Hellinger_model(path, fit_Hellinger_tree(features, labels, numBins=20, cutoff=5))
+    content = path.read_bytes()
+
+    path.write_bytes(b"NOTMODEL" + content[len(MAGIC):])
+    with pytest.raises(ValueError, match="Not a Hellinger model file"):
+        load_Hellinger_model(path)
+
+    path.write_bytes(MAGIC + struct.pack("<I", VERSION + 1) + content[len(MAGIC) + 4:])
+    with pytest.raises(ValueError, match="Unsupported Hellinger model file version"):
+        load_Hellinger_model(path)
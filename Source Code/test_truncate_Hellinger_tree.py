@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from HDDT_binned import HDDT_binned
+from HellingerTreeNode import HellingerTreeNode
+from make_dataset import make_dataset
+from bin_features import bin_features
+from sweep_Hellinger_forest import sweep_Hellinger_forest
+from truncate_Hellinger_tree import truncate_Hellinger_tree
+
+
+@pytest.fixture(scope="module")
+def binned():
+    features, labels = make_dataset(3000, 8, 0.1, seed=2)
+    codes, edges = bin_features(features, 60)
+    return features, labels, codes, edges, np.arange(0, 3000, 2)
+
+
+@pytest.mark.parametrize("cutoff", [5, 10, 40, 200])
+def test_truncation_matches_growing_with_cutoff(binned, cutoff, assert_same_tree):
+    _, labels, codes, edges, rows = binned
+    grown = HDDT_binned(codes, edges, labels, HellingerTreeNode(), 60, 5, rows=rows)
+    expected = HDDT_binned(codes, edges, labels, HellingerTreeNode(), 60, cutoff, rows=rows)
+    assert_same_tree(truncate_Hellinger_tree(grown, cutoff), expected)
+
+
+@pytest.mark.parametrize("num_bins", [20, 30, 60])
+def test_merged_bins_match_coarse_binning(binned, num_bins, assert_same_tree):
+    _, labels, codes, edges, rows = binned
+    merge = 60 // num_bins
+    tree = HDDT_binned(codes, edges, labels, HellingerTreeNode(), num_bins, 5, rows=rows, merge=merge)
+    expected = HDDT_binned(codes // merge, edges[merge - 1::merge], labels, HellingerTreeNode(), num_bins, 5, rows=rows)
+    assert_same_tree(tree, expected)
+
+
+def test_sweep_is_independent_of_workers(binned):
+    features, labels = binned[:2]
+    settings = dict(numBinsGrid=(20, 30), cutoffGrid=(5, 40), minFeatureRatioGrid=(0.5, 1.0), numFolds=3, seed=4)
+    results = sweep_Hellinger_forest(features, labels, 3, **settings)
+    assert len(results) == 2 * 2 * 2 * 3
+    assert results == sweep_Hellinger_forest(features, labels, 3, nJobs=2, **settings)
@@ -0,0 +1,50 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#       This function routes instances through compiled Hellinger trees. Instead of walking the tree one         *
+#     instance at a time, all instances that have not reached a leaf are advanced by one level per iteration     *
+#      using vectorized gathers of their current node's feature, threshold and children, so the number of        *
+#                       Python-level iterations is bounded by the depth of the tree.                             *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+import numpy as np
+from scipy.sparse import issparse
+
+
+def traverse_Hellinger_arrays(tree, features, rows=None, nodes=None):
+    """
+        Find the leaf node reached by each instance.
+
+        Parameters:
+            tree                    : A compiled model with feature, threshold, left and right node arrays,
+                                      e.g. HellingerTreeArrays.
+            features (numpy.ndarray): I x F numeric matrix of instances, or a scipy.sparse CSR matrix.
+            rows (numpy.ndarray)    : Optional row of features routed by each entry. Default: every row once.
+            nodes (numpy.ndarray)   : Optional start node of each entry. Default: node 0 (the root).
+
+        Returns:
+            nodes (numpy.ndarray): Index of the leaf node reached by each entry.
+    """
+
+    if rows is None:
+        rows = np.arange(features.shape[0])
+    if nodes is None:
+        nodes = np.zeros(rows.shape[0], dtype=np.intp)
+    else:
+        nodes = np.array(nodes, dtype=np.intp)
+
+    active = np.flatnonzero(tree.feature[nodes] >= 0)
+    while active.size:                                                                          # Advance every unfinished entry by one level
+        current = nodes[active]
+        split_feature = tree.feature[current]
+        values = features[rows[active], split_feature]
+        if issparse(features):                                                                  # Sparse indexing returns a 1 x N matrix
+            values = np.asarray(values).reshape(-1)
+        go_left = values <= tree.threshold[current]
+        following = np.where(go_left, tree.left[current], tree.right[current])
+        nodes[active] = following
+        active = active[tree.feature[following] >= 0]
+
+    return nodes
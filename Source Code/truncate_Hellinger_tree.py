@@ -0,0 +1,54 @@
+#*****************************************************************************************************************
+#                                                                                                                *
+#        This function derives the tree for a larger cutoff from a tree grown with a smaller one. A node is      *
+#      only split while it holds more than cutoff instances, and the splits above it do not depend on the        *
+#     cutoff, so the larger-cutoff tree is the grown tree with every node of at most cutoff instances turned      *
+#          into a leaf. Labels and scores of the new leaves come from the class counts stored in the nodes.      *
+#                                                                                                                *
+#*****************************************************************************************************************
+
+
+
+from HellingerTreeNode import HellingerTreeNode
+
+
+def truncate_Hellinger_tree(model, cutoff):
+    """
+        Prune a trained Hellinger Distance Decision Tree to a larger cutoff.
+
+        Parameters:
+            model (HellingerTreeNode): A trained Hellinger Distance Decision Tree model with class counts in its nodes.
+            cutoff (int)             : Maximum number of instances in a leaf node; at least the cutoff the tree was grown with.
+
+        Returns:
+            tree (HellingerTreeNode): A new tree, the same as training with this cutoff would give. model is not changed.
+    """
+
+    if cutoff <= 0:
+        raise ValueError("cutoff must be positive")
+
+    tree = HellingerTreeNode()
+    stack = [(model, tree)]                                                                     # Iterative depth-first copy, no recursion limit
+    while stack:
+        node, copy = stack.pop()
+        if node.counts is None:
+            raise ValueError("Tree nodes have no class counts; train the tree again to truncate it")
+        num_samples = int(node.counts[0] + node.counts[1])
+        copy.counts = node.counts
+
+        if node.complete or num_samples <= cutoff:                                              # Leaf of the grown tree or small enough to stop
+            if node.complete:
+                copy.feature, copy.threshold = node.feature, node.threshold
+                copy.complete, copy.label, copy.score = True, node.label, node.score
+            else:
+                copy.make_leaf()
+            continue
+
+        copy.feature = node.feature
+        copy.threshold = node.threshold
+        copy.left_branch = HellingerTreeNode()
+        copy.right_branch = HellingerTreeNode()
+        stack.append((node.right_branch, copy.right_branch))
+        stack.append((node.left_branch, copy.left_branch))
+
+    return tree